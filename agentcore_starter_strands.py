@@ -2,40 +2,54 @@
 Strands Agent sample with AgentCore
 """
 import os
-from strands import Agent, tool
-from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig, RetrievalConfig
-from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
-from bedrock_agentcore.tools.code_interpreter_client import CodeInterpreter
+# strands and the AgentCore memory integration load on first use (see
+# _build_agent), so the container answers /ping without waiting for them.
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from metrics import PROFILER_ENABLED, TRACE_RESPONSES, metrics, profiler, span, timed, trace_scope
+from request_context import current_request, request_from_context, request_scope, stream_callback_handler, stream_events
+from runtime_cache import (
+    AGENT_CACHE_MAX_ENTRIES,
+    AGENT_IDLE_SECONDS,
+    CODE_INTERPRETER_IDLE_SECONDS,
+    CODE_INTERPRETER_MAX_SESSIONS,
+    CachedAgent,
+    IdleCache,
+    StageTimingHooks,
+    close_cached_agent,
+    get_bedrock_model,
+    preload_modules,
+    start_code_interpreter,
+    stop_code_interpreter,
+    strands_tools,
+    timed_memory_retrieval,
+)
+from summarize import MapReduceSummarizer
 
 app = BedrockAgentCoreApp()
 
 MEMORY_ID = os.getenv("BEDROCK_AGENTCORE_MEMORY_ID")
 REGION = os.getenv("AWS_REGION")
 MODEL_ID = "arn:aws:bedrock:us-east-2:746630811346:inference-profile/us.amazon.nova-micro-v1:0"
+# imported in the background once the server is up
+PRELOAD_MODULES = ["strands", "bedrock_agentcore.memory.integrations.strands.session_manager"]
 
-ci_sessions = {}
-current_session = None
+# Long texts are summarized chunk by chunk in parallel, then merged
+summarizer = MapReduceSummarizer(MODEL_ID, region_name=REGION)
+
+# One code-interpreter sandbox per session, stopped once it sits idle
+ci_sessions = IdleCache(
+    idle_seconds=CODE_INTERPRETER_IDLE_SECONDS,
+    max_entries=CODE_INTERPRETER_MAX_SESSIONS,
+    on_evict=stop_code_interpreter,
+).start_reaper()
 
-@tool
 def calculate(code: str) -> str:
     """Execute Python code for calculations or analysis."""
-    session_id = current_session or 'default'
+    session_id = current_request().session_id
 
-    if session_id not in ci_sessions:
-        ci_sessions[session_id] = {
-            'client': CodeInterpreter(REGION),
-            'session_id': None
-        }
+    ci = ci_sessions.get_or_create(session_id, lambda: start_code_interpreter(session_id, REGION))
 
-    ci = ci_sessions[session_id]
-    if not ci['session_id']:
-        ci['session_id'] = ci['client'].start(
-            name=f"session_{session_id[:30]}",
-            session_timeout_seconds=1800
-        )
-
-    result = ci['client'].invoke("executeCode", {
+    result = ci.invoke("executeCode", {
         "code": code,
         "language": "python"
     })
@@ -45,36 +59,23 @@ def calculate(code: str) -> str:
             return stdout
     return "Executed"
 
-@tool
 def summarize_text(content: str) -> str:
-        """Summarize the provided text using the LLM."""
-        from boto3 import client
-        import json
-
-        bedrock = client("bedrock-runtime", region_name=REGION)
-        response = bedrock.invoke_model(
-            modelId=MODEL_ID,
-            body=json.dumps({
-                "messages": [
-                    {"role": "user", "content": f"Summarize the following text:\n\n{content}"}
-                ]
-            }),
-        )
+    """Summarize the provided text using the LLM."""
+    return summarizer.summarize(content)
 
-        result = json.loads(response["body"].read())
-        return result["output"]["message"]["content"][0]["text"]
-    
-@app.entrypoint
-def invoke(payload, context):
-    global current_session
 
-    if not MEMORY_ID:
-        return {"error": "Memory not configured"}
+agents = IdleCache(
+    idle_seconds=AGENT_IDLE_SECONDS,
+    max_entries=AGENT_CACHE_MAX_ENTRIES,
+    on_evict=close_cached_agent,
+).start_reaper()
 
-    actor_id = context.headers.get('X-Amzn-Bedrock-AgentCore-Runtime-Custom-Actor-Id', 'user') if hasattr(context, 'headers') else 'user'
 
-    session_id = getattr(context, 'session_id', 'default')
-    current_session = session_id
+@timed("agent.build")
+def _build_agent(session_id, actor_id):
+    from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig, RetrievalConfig
+    from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
+    from strands import Agent
 
     memory_config = AgentCoreMemoryConfig(
         memory_id=MEMORY_ID,
@@ -85,17 +86,49 @@ def invoke(payload, context):
             f"/users/{actor_id}/preferences": RetrievalConfig(top_k=3, relevance_score=0.5)
         }
     )
+    session_manager = timed_memory_retrieval(AgentCoreMemorySessionManager(memory_config, REGION))
 
     agent = Agent(
-        model=MODEL_ID,
-        session_manager=AgentCoreMemorySessionManager(memory_config, REGION),
+        model=get_bedrock_model(MODEL_ID, REGION),
+        session_manager=session_manager,
+        hooks=[StageTimingHooks()],
+        callback_handler=stream_callback_handler,
         # system_prompt="You are a helpful assistant. Use tools when appropriate.",
         system_prompt="You are a helpful assistant that summarizes text clearly and concisely.",
-        tools=[summarize_text]
+        tools=strands_tools([summarize_text])
     )
+    return CachedAgent(agent, session_manager)
 
-    result = agent(payload.get("prompt", ""))
-    return {"response": result.message.get('content', [{}])[0].get('text', str(result))}
+
+@app.entrypoint
+def invoke(payload, context):
+    """One agent turn. With ``"stream": true`` in the payload, returns an async
+    generator of events instead: "start", progress and "token" events while
+    the turn runs, then "done" carrying the usual response fields."""
+    if not MEMORY_ID:
+        return {"error": "Memory not configured"}
+
+    session_id, actor_id = request_from_context(context)
+    if payload.get("stream"):
+        return stream_events(lambda: _run_turn(payload, session_id, actor_id))
+    return _run_turn(payload, session_id, actor_id)
+
+
+def _run_turn(payload, session_id, actor_id):
+    with trace_scope() as trace:
+        cached = agents.get_or_create(
+            (session_id, actor_id), lambda: _build_agent(session_id, actor_id)
+        )
+        with request_scope(session_id, actor_id), cached.lock, span("agent.invoke"):
+            result = cached.agent(payload.get("prompt", ""))
+    response = {"response": result.message.get('content', [{}])[0].get('text', str(result))}
+    if payload.get("trace", TRACE_RESPONSES):
+        response["trace"] = trace.to_dict()
+    return response
 
 if __name__ == "__main__":
+    preload_modules(PRELOAD_MODULES)
+    metrics.start_reporter()
+    if PROFILER_ENABLED:
+        profiler.start()
     app.run()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Near-duplicate detection: MinHash/LSH index vs exact pairwise Jaccard.
+
+The corpus is the checked-in CSV postings (which already hold a few
+reposts), padded with --distinct synthetic postings stitched from random
+sentences of the real ones, plus --reposts near-copies of random postings
+under new job_ids (a sentence dropped, an agency footer added).
+
+    exact     every posting compared with every earlier one on its shingle
+              sets; O(n^2), the ground truth
+    lsh       DedupIndex, as the agent uses it
+
+For both it prints the time and how many postings were flagged as
+duplicates; for LSH also recall and precision against the exact pass. The
+last lines show what dedup saves downstream: postings scanned for skills
+and tokens of corpus text.
+
+Run from the repo root:
+    python -m benchmarks.bench_dedup --distinct 2000 --reposts 300
+"""
+import argparse
+import random
+import re
+import time
+
+from benchmarks.fixtures import load_csv_rows
+from dedup import DEDUP_THRESHOLD, DedupIndex, shingles
+from job_summary import estimate_tokens
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+FOOTERS = [
+    "Posted by Apex Staffing on behalf of our client.",
+    "Apply through TalentBridge Recruiting today.",
+    "This role is offered via Horizon Consulting Partners.",
+]
+
+
+def build_corpus(distinct, reposts, seed=0):
+    rng = random.Random(seed)
+    rows = load_csv_rows()
+    jobs = [dict(row, job_id=str(row["job_id"])) for row in rows]
+    sentences = [s for row in rows for s in _SENTENCE.split(row["description"] or "") if len(s) > 40]
+    for i in range(distinct):
+        jobs.append({
+            "job_id": f"synthetic-{i}",
+            "title": rng.choice(rows)["title"],
+            "description": " ".join(rng.sample(sentences, 15)),
+        })
+    for i in range(reposts):
+        original = rng.choice(jobs)
+        parts = _SENTENCE.split(original["description"] or "")
+        if len(parts) > 8:
+            del parts[rng.randrange(len(parts))]
+        parts.append(rng.choice(FOOTERS))
+        jobs.insert(rng.randrange(len(jobs) + 1), {
+            **original, "job_id": f"repost-{i}", "description": " ".join(parts),
+        })
+    return jobs
+
+
+def exact_duplicates(jobs, threshold):
+    """job_ids whose shingle set has Jaccard >= threshold with an earlier canonical posting."""
+    canonical, duplicates = [], set()
+    for job in jobs:
+        current = shingles(job["description"])
+        if current and any(len(current & seen) / len(current | seen) >= threshold for seen in canonical):
+            duplicates.add(job["job_id"])
+        elif current:
+            canonical.append(current)
+    return duplicates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--distinct", type=int, default=2000, help="synthetic distinct postings added")
+    parser.add_argument("--reposts", type=int, default=300, help="near-copies added")
+    parser.add_argument("--threshold", type=float, default=DEDUP_THRESHOLD)
+    parser.add_argument("--skip-exact", action="store_true", help="skip the O(n^2) ground truth")
+    args = parser.parse_args()
+
+    jobs = build_corpus(args.distinct, args.reposts)
+    print(f"corpus: {len(jobs)} postings")
+
+    index = DedupIndex(threshold=args.threshold)
+    start = time.perf_counter()
+    kept = list(index.unique(jobs))
+    lsh_s = time.perf_counter() - start
+    flagged = {job["job_id"] for job in jobs} - {job["job_id"] for job in kept}
+    print(f"lsh:   {lsh_s:7.2f}s  {len(flagged)} duplicates  "
+          f"({1000 * lsh_s / len(jobs):.2f} ms/posting)")
+
+    if not args.skip_exact:
+        start = time.perf_counter()
+        truth = exact_duplicates(jobs, args.threshold)
+        exact_s = time.perf_counter() - start
+        hits = len(flagged & truth)
+        print(f"exact: {exact_s:7.2f}s  {len(truth)} duplicates")
+        print(f"lsh recall {hits / len(truth) if truth else 1:.3f}, "
+              f"precision {hits / len(flagged) if flagged else 1:.3f}")
+
+    tokens = sum(estimate_tokens(job["description"] or "") for job in jobs)
+    kept_tokens = sum(estimate_tokens(job["description"] or "") for job in kept)
+    print(f"skill scan: {len(kept)} of {len(jobs)} postings; "
+          f"corpus tokens: {kept_tokens:,} of {tokens:,} ({100 * (1 - kept_tokens / tokens):.1f}% saved)")
+
+
+if __name__ == "__main__":
+    main()
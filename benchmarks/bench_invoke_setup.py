@@ -0,0 +1,125 @@
+"""
+Per-request setup cost of the AgentCore entrypoints, before and after reuse.
+
+"before" rebuilds AgentCoreMemoryConfig, AgentCoreMemorySessionManager and
+Agent (with its bedrock-runtime client) on every request, as invoke used to;
+"after" is the cached path through runtime_cache. Also times a new boto3
+client per summarize_text call against the shared one.
+
+Nothing talks to AWS: the session manager's memory reads are replaced by a
+sleep of --memory-latency-ms each and the model is never called.
+
+Run from the repo root:
+    python -m benchmarks.bench_invoke_setup --requests 200 --sessions 10
+"""
+import argparse
+import os
+import time
+
+from benchmarks.bench_scrape import percentile
+
+
+def report(name, timings):
+    total = sum(timings)
+    print(f"{name:<34} {len(timings):>5} calls  mean {total / len(timings) * 1000:8.2f} ms  "
+          f"p50 {percentile(timings, 50) * 1000:8.2f} ms  p99 {percentile(timings, 99) * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--sessions", type=int, default=10, help="distinct (session, actor) pairs")
+    parser.add_argument("--memory-latency-ms", type=float, default=30,
+                        help="simulated AgentCore Memory round trip when a session manager loads a session")
+    args = parser.parse_args()
+
+    # job_market_agent reads these at import time
+    os.environ.setdefault("AWS_REGION", "us-east-2")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    os.environ["BEDROCK_AGENTCORE_MEMORY_ID"] = "bench-memory"
+    os.environ["CACHE_BACKEND"] = "memory"
+    os.environ["CORPUS_BACKEND"] = "memory"
+    import boto3
+    from bedrock_agentcore.memory.integrations.strands import session_manager as memory_session
+    from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig, RetrievalConfig
+    from strands import Agent
+    from strands.types.session import Session, SessionType
+
+    import job_market_agent as jma
+    from runtime_cache import get_client, strands_tools
+
+    class StubSessionManager(memory_session.AgentCoreMemorySessionManager):
+        """Real construction (boto3 session, MemoryClient); memory I/O is a sleep."""
+
+        def read_session(self, session_id, **kwargs):
+            time.sleep(args.memory_latency_ms / 1000)
+            return Session(session_id=session_id, session_type=SessionType.AGENT)
+
+        def initialize(self, agent, **kwargs):
+            time.sleep(args.memory_latency_ms / 1000)  # read_agent + restore
+
+        def append_message(self, message, agent, **kwargs):
+            pass
+
+        def sync_agent(self, agent, **kwargs):
+            pass
+
+        def close(self):
+            pass
+
+    # _build_agent imports the session manager class when it runs
+    memory_session.AgentCoreMemorySessionManager = StubSessionManager
+    keys = [(f"session-{i % args.sessions:04d}-{'x' * 24}", "user") for i in range(args.requests)]
+
+    def build_every_request(session_id, actor_id):
+        memory_config = AgentCoreMemoryConfig(
+            memory_id=jma.MEMORY_ID,
+            session_id=session_id,
+            actor_id=actor_id,
+            retrieval_config={
+                f"/users/{actor_id}/facts": RetrievalConfig(top_k=3, relevance_score=0.5),
+                f"/users/{actor_id}/preferences": RetrievalConfig(top_k=3, relevance_score=0.5),
+            },
+        )
+        return Agent(
+            model=jma.MODEL_ID,
+            session_manager=StubSessionManager(memory_config, jma.REGION),
+            system_prompt=jma.SYSTEM_PROMPT,
+            tools=strands_tools([jma.scrape_and_extract_skills, jma.query_job_postings]),
+        )
+
+    before = []
+    for session_id, actor_id in keys:
+        start = time.perf_counter()
+        build_every_request(session_id, actor_id)
+        before.append(time.perf_counter() - start)
+
+    after = []
+    for session_id, actor_id in keys:
+        start = time.perf_counter()
+        jma.agents.get_or_create((session_id, actor_id), lambda: jma._build_agent(session_id, actor_id))
+        after.append(time.perf_counter() - start)
+
+    client_before, client_after = [], []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        boto3.client("bedrock-runtime", region_name=jma.REGION)
+        client_before.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        get_client("bedrock-runtime", jma.REGION)
+        client_after.append(time.perf_counter() - start)
+
+    print(f"\n{args.requests} requests over {args.sessions} sessions, "
+          f"memory round trip {args.memory_latency_ms:.0f} ms (stubbed)")
+    report("agent setup, rebuilt per request", before)
+    report("agent setup, cached per session", after)
+    report("bedrock-runtime client, per call", client_before)
+    report("bedrock-runtime client, shared", client_after)
+    saved = (sum(before) - sum(after)) / len(keys)
+    print(f"saved per request: {saved * 1000:.2f} ms agent setup, "
+          f"{(sum(client_before) - sum(client_after)) / len(keys) * 1000:.2f} ms per summarize_text call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Job-posting parse throughput: the original double parse (html.parser, then
+clean_html re-parsing str() of the description tag) against the single-parse
+parse_job_html, inline and fanned out over a process pool.
+
+Run from the repo root:
+    python -m benchmarks.bench_parse [n_pages]
+"""
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+import scraper
+from benchmarks.fixtures import fixture_postings
+
+FETCHED_AT = "2025-01-01 00:00:00"
+
+
+def legacy_parse(job_id, html, fetched_at):
+    """get_job_details as it was before the parse stage was split out."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    def extract_text(selector, class_name):
+        tag = soup.find(selector, {"class": class_name})
+        return tag.text.strip() if tag else None
+
+    def clean_html(text):
+        if not text:
+            return ""
+        text = BeautifulSoup(text, "html.parser").get_text(" ")
+        return re.sub(r"\s+", " ", text).strip()
+
+    return {
+        "job_id": job_id,
+        "title": extract_text("h2", "top-card-layout__title"),
+        "company": extract_text("a", "topcard__org-name-link"),
+        "description": clean_html(str(soup.find("div", {"class": "show-more-less-html__markup"}))),
+        "url": f"https://www.linkedin.com/jobs/view/{job_id}",
+        "fetched_at": fetched_at,
+    }
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    postings = list(fixture_postings().items())
+    pages = [
+        (f"{postings[i % len(postings)][0]}-{i}", postings[i % len(postings)][1], FETCHED_AT)
+        for i in range(n)
+    ]
+    print(f"{n} pages, {sum(len(p[1]) for p in pages) / n / 1024:.1f} KiB average, parser={scraper.HTML_PARSER}")
+
+    legacy, legacy_s = timed(lambda: [legacy_parse(*page) for page in pages])
+    inline, inline_s = timed(lambda: [scraper.parse_job_html(*page) for page in pages])
+    # as with SCRAPER_STREAM_PARSE_IN_POOL=1: one task per page; the pool is
+    # started first so its startup isn't counted
+    pool = scraper._get_parse_pool()
+    pool.submit(scraper._parse_page, pages[0]).result()
+    def parse_in_pool():
+        futures = [pool.submit(scraper._parse_page, page) for page in pages]
+        return [future.result()[0] for future in futures]
+
+    pooled, pooled_s = timed(parse_in_pool)
+
+    assert inline == legacy, "single-parse output differs from the original"
+    assert pooled == legacy, "process-pool output differs from the original"
+
+    for label, seconds in (
+        ("double parse (html.parser)", legacy_s),
+        ("single parse, inline", inline_s),
+        ("single parse, process pool", pooled_s),
+    ):
+        print(f"{label:28s} {seconds:7.2f}s  {n / seconds:8.0f} pages/s  {legacy_s / seconds:5.1f}x")
@@ -0,0 +1,81 @@
+"""
+End-to-end scrape_jobs benchmark against the local LinkedIn stand-in.
+
+Reports jobs/sec, p50/p99 per-request latency and peak memory for one full
+scrape_jobs run, with no traffic to linkedin.com.
+
+Run from the repo root:
+    python -m benchmarks.bench_scrape --pages 2 --workers 4 --latency-ms 150
+"""
+import argparse
+import os
+import resource
+import time
+import tracemalloc
+
+from benchmarks.linkedin_standin import StandinConfig, start_standin
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--role", default="Data Scientist")
+    parser.add_argument("--location", default="United States")
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=0, help="client rate limit, 0 = unlimited")
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start_standin(StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=0,
+    ))
+    # scraper reads these at import time
+    os.environ["LINKEDIN_HOST"] = server.url
+    os.environ["SCRAPER_REQUESTS_PER_SECOND"] = str(args.rps)
+    os.environ["JOB_CACHE_BACKEND"] = "memory"
+    import scraper
+
+    latencies = []
+    session_get = scraper.http.session.get
+
+    def timed_get(*a, **kw):
+        start = time.perf_counter()
+        try:
+            return session_get(*a, **kw)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    scraper.http.session.get = timed_get
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    jobs = scraper.scrape_jobs(args.role, args.location, args.pages, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    server.shutdown()
+
+    print(f"\nscrape_jobs('{args.role}', pages={args.pages}, workers={args.workers}, rps={args.rps or 'unlimited'})")
+    print(f"jobs:             {len(jobs)} in {elapsed:.2f}s = {len(jobs) / elapsed:.1f} jobs/s")
+    print(f"requests:         {len(latencies)}  p50 {percentile(latencies, 50) * 1000:.0f} ms  "
+          f"p99 {percentile(latencies, 99) * 1000:.0f} ms")
+    print(f"peak traced heap: {peak / 2**20:.1f} MiB  (max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB)")
+    print(f"server:           {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
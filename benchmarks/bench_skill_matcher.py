@@ -0,0 +1,91 @@
+"""
+Throughput of the compiled SkillMatcher against a per-keyword regex loop
+(the original extract_skills_from_jobs approach), and how matcher
+throughput changes as the taxonomy grows.
+
+Run from the repo root:
+    python -m benchmarks.bench_skill_matcher [n_descriptions]
+"""
+import csv
+import random
+import re
+import string
+import sys
+import time
+
+from benchmarks.fixtures import CSV_FILES
+from skills import _LEFT, _RIGHT, SkillMatcher, extract_skills_from_jobs, load_taxonomy
+
+TAXONOMY_SIZES = [200, 2000, 10000]
+
+
+def load_descriptions(n):
+    csv.field_size_limit(sys.maxsize)
+    descriptions = []
+    for path in CSV_FILES:
+        with open(path, newline="", encoding="utf-8") as f:
+            descriptions.extend(row["description"] for row in csv.DictReader(f) if row["description"])
+    # repeat the checked-in postings until we have n of them
+    return [descriptions[i % len(descriptions)] for i in range(n)]
+
+
+def legacy_extract_skills(jobs_list, skills):
+    """The original nested loop: one re.search per keyword per job."""
+    skill_counts = {}
+    for job in jobs_list:
+        desc = job.get("description")
+        if not desc:
+            continue
+        found = set()
+        for skill in skills:
+            keywords = [(k, re.IGNORECASE) for k in skill["aliases"]]
+            keywords += [(k, 0) for k in skill["case_sensitive_aliases"]]
+            for keyword, flags in keywords:
+                if re.search(_LEFT + re.escape(keyword) + _RIGHT, desc, flags):
+                    found.add(skill["name"])
+                    break
+        for name in found:
+            skill_counts[name] = skill_counts.get(name, 0) + 1
+    return skill_counts
+
+
+def synthetic_taxonomy(size, seed=0):
+    """The real taxonomy padded with random made-up skills up to ``size``."""
+    rng = random.Random(seed)
+    skills = load_taxonomy()
+    while len(skills) < size:
+        alias = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12)))
+        skills.append({
+            "name": f"synthetic-{len(skills)}",
+            "category": "technical",
+            "aliases": [alias],
+            "case_sensitive_aliases": [],
+        })
+    return skills
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    jobs = [{"description": d} for d in load_descriptions(n)]
+    skills = load_taxonomy()
+
+    legacy, legacy_s = timed(legacy_extract_skills, jobs, skills)
+    compiled, compiled_s = timed(extract_skills_from_jobs, jobs)
+    assert compiled == legacy, "compiled matcher disagrees with the per-keyword loop"
+
+    print(f"{n} descriptions, {len(skills)} skills")
+    print(f"per-keyword loop: {legacy_s:7.2f}s  {n / legacy_s:9.0f} jobs/s")
+    print(f"compiled matcher: {compiled_s:7.2f}s  {n / compiled_s:9.0f} jobs/s")
+    print(f"speedup:          {legacy_s / compiled_s:7.1f}x")
+
+    print("\nmatcher throughput by taxonomy size")
+    for size in TAXONOMY_SIZES:
+        matcher, build_s = timed(SkillMatcher, synthetic_taxonomy(size))
+        _, scan_s = timed(lambda: [matcher.find_skills(job["description"]) for job in jobs])
+        print(f"{size:6d} skills: build {build_s:5.2f}s  {n / scan_s:9.0f} jobs/s")
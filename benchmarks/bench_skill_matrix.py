@@ -0,0 +1,101 @@
+"""
+Batch skill matrix vs the per-job loop on synthetic job descriptions.
+
+Descriptions are stitched together from sentences of the checked-in
+postings, so skill density and text length match real data. Both sides
+compute skill counts, skill co-occurrence and a per-company breakdown:
+the loop by walking jobs one at a time, the batch path with
+extract_skill_matrix and matrix products.
+
+Run from the repo root:
+    python -m benchmarks.bench_skill_matrix --jobs 100000 --processes 4
+"""
+import argparse
+from collections import Counter
+from itertools import combinations
+import random
+import re
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import load_csv_rows
+
+
+def synthetic_jobs(n, sentences_per_job=12, repost_rate=0.0, seed=0):
+    rng = random.Random(seed)
+    rows = load_csv_rows()
+    sentences = [s for row in rows for s in re.split(r"(?<=[.!?]) ", row["description"] or "") if s]
+    companies = sorted({row["company"] for row in rows if row["company"]})
+    descriptions = []
+    for i in range(n):
+        if descriptions and rng.random() < repost_rate:
+            descriptions.append(rng.choice(descriptions))  # same posting under a new job_id
+        else:
+            descriptions.append(" ".join(rng.choice(sentences) for _ in range(sentences_per_job)))
+    return pd.DataFrame({
+        "job_id": [str(4_000_000_000 + i) for i in range(n)],
+        "company": [rng.choice(companies) for _ in range(n)],
+        "description": descriptions,
+    })
+
+
+def per_job_loop(frame, matcher):
+    counts, pairs, by_company = Counter(), Counter(), {}
+    for company, description in zip(frame["company"], frame["description"]):
+        found = matcher.find_skills(description)
+        counts.update(found)
+        pairs.update(combinations(sorted(found), 2))
+        by_company.setdefault(company, Counter()).update(found)
+    return counts, pairs, by_company
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--sentences", type=int, default=12, help="sentences per synthetic description")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes for the batch scan")
+    parser.add_argument("--repost-rate", type=float, default=0.0, help="share of rows repeating an earlier description")
+    args = parser.parse_args()
+
+    from skill_matrix import extract_skill_matrix
+    from skills import get_skill_matcher
+
+    matcher = get_skill_matcher()
+    start = time.perf_counter()
+    frame = synthetic_jobs(args.jobs, args.sentences, args.repost_rate)
+    chars = frame["description"].str.len().sum()
+    print(f"{len(frame)} descriptions, {chars / 2**20:.0f} MiB of text, "
+          f"generated in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    counts, pairs, by_company = per_job_loop(frame, matcher)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skill_matrix = extract_skill_matrix(frame, processes=args.processes)
+    extract_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch_counts = skill_matrix.counts()
+    cooccurrence = skill_matrix.cooccurrence()
+    batch_by_company = skill_matrix.by(frame["company"])
+    aggregate_time = time.perf_counter() - start
+
+    # both paths must agree
+    assert {k: v for k, v in batch_counts.items() if v} == dict(counts)
+    a, b = next(iter(pairs))
+    assert cooccurrence.loc[a, b] == pairs[(a, b)]
+    company = frame["company"].iloc[0]
+    assert {k: v for k, v in batch_by_company.loc[company].items() if v} == dict(by_company[company])
+
+    batch_time = extract_time + aggregate_time
+    print(f"per-job loop:   {loop_time:6.2f}s  ({len(frame) / loop_time:,.0f} jobs/s)")
+    print(f"batch matrix:   {batch_time:6.2f}s  ({len(frame) / batch_time:,.0f} jobs/s)  "
+          f"extract {extract_time:.2f}s + aggregates {aggregate_time:.3f}s")
+    print(f"matrix:         {skill_matrix.shape[0]} x {skill_matrix.shape[1]}, "
+          f"{skill_matrix.matrix.nnz:,} non-zeros ({skill_matrix.matrix.data.nbytes / 2**20:.1f} MiB)")
+    print(f"top skills:     {', '.join(f'{k} {v}' for k, v in batch_counts.head(5).items())}")
+
+
+if __name__ == "__main__":
+    main()
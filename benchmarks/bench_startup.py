@@ -0,0 +1,117 @@
+"""
+Cold-start cost of the AgentCore entrypoints, checked against a budget.
+
+For each entrypoint module, in fresh interpreters:
+
+    import    seconds to import the module (what every cold start pays
+              before app.run can even begin)
+    ready     seconds from launching ``python <module>.py`` until /ping
+              answers, i.e. what AgentCore waits for before routing traffic
+
+Each is the median of --runs runs. The script exits non-zero when a median
+exceeds STARTUP_BUDGET_SECONDS, so it can gate CI; raise a budget only
+together with the change that needs it.
+
+Nothing talks to AWS. "ready" binds port 8080 (app.run's default), which
+must be free.
+
+Run from the repo root:
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ENTRYPOINTS = ["job_market_agent", "agentcore_starter_strands"]
+
+# Medians on a 1 vCPU container were 0.50s / 0.59s (job_market_agent) and
+# 0.34s / 0.57s (agentcore_starter_strands). Before strands, pyarrow and
+# pandas were deferred they were 1.30s / 1.43s and 0.70s / 0.96s.
+STARTUP_BUDGET_SECONDS = {
+    ("job_market_agent", "import"): 0.8,
+    ("job_market_agent", "ready"): 1.0,
+    ("agentcore_starter_strands", "import"): 0.6,
+    ("agentcore_starter_strands", "ready"): 1.0,
+}
+
+PING_URL = "http://127.0.0.1:8080/ping"
+
+
+def bench_env():
+    env = dict(os.environ)
+    env.setdefault("AWS_REGION", "us-east-2")
+    env.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    env.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    env.setdefault("BEDROCK_AGENTCORE_MEMORY_ID", "bench-memory")
+    env["PREWARM_ENABLED"] = "0"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    return env
+
+
+def time_import(module, env):
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - started)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def ping():
+    try:
+        with urllib.request.urlopen(PING_URL, timeout=0.5) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def time_ready(module, env, timeout=60):
+    if ping():
+        raise SystemExit(f"Something is already serving {PING_URL}; stop it first")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, f"{module}.py"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while not ping():
+            if process.poll() is not None:
+                raise SystemExit(f"{module}.py exited with {process.returncode} before it was ready")
+            if time.perf_counter() - started > timeout:
+                raise SystemExit(f"{module}.py not ready after {timeout}s")
+            time.sleep(0.01)
+        return time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-ready", action="store_true", help="only time the imports")
+    args = parser.parse_args()
+
+    env = bench_env()
+    over_budget = []
+    for module in ENTRYPOINTS:
+        stages = {"import": time_import}
+        if not args.skip_ready:
+            stages["ready"] = time_ready
+        for stage, measure in stages.items():
+            median = statistics.median(measure(module, env) for _ in range(args.runs))
+            budget = STARTUP_BUDGET_SECONDS[(module, stage)]
+            status = "ok" if median <= budget else "OVER BUDGET"
+            print(f"{module:<28} {stage:<7} median {median:6.3f}s  budget {budget:5.2f}s  {status}")
+            if median > budget:
+                over_budget.append((module, stage))
+
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
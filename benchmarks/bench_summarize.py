@@ -0,0 +1,96 @@
+"""
+summarize_text on a full scrape's worth of postings: one call vs map-reduce.
+
+Bedrock is replaced by StubBedrockClient, whose latency grows with the
+prompt and the generated summary like a real model's (--ms-per-1k-input,
+--ms-per-output-token). "single call" is the old path: the whole text in
+one invoke_model call. It is reported even when the text exceeds
+--context-tokens, where the real model would reject it. "map-reduce cold"
+starts with an empty chunk cache; "map-reduce warm" repeats the same input.
+
+Run from the repo root:
+    python -m benchmarks.bench_summarize --jobs 100
+"""
+import argparse
+import io
+import json
+import threading
+import time
+
+from benchmarks.fixtures import load_csv_rows
+from summarize import MapReduceSummarizer, SUMMARY_CHUNK_TOKENS, SUMMARY_MAX_WORKERS
+
+
+class StubBedrockClient:
+    """``invoke_model`` look-alike that sleeps instead of calling Bedrock."""
+
+    def __init__(self, ms_per_1k_input=150, ms_per_output_token=8, output_tokens=200, base_ms=300):
+        self.ms_per_1k_input = ms_per_1k_input
+        self.ms_per_output_token = ms_per_output_token
+        self.output_tokens = output_tokens
+        self.base_ms = base_ms
+        self.calls = 0
+        self.input_tokens = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId, body):
+        from job_summary import estimate_tokens
+
+        prompt = json.loads(body)["messages"][0]["content"]
+        tokens = estimate_tokens(prompt)
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += tokens
+        time.sleep((self.base_ms + tokens / 1000 * self.ms_per_1k_input
+                    + self.output_tokens * self.ms_per_output_token) / 1000)
+        text = prompt[-self.output_tokens * 4:]  # a "summary" of realistic length
+        payload = {"output": {"message": {"content": [{"text": text}]}}}
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100, help="postings concatenated into the input")
+    parser.add_argument("--workers", type=int, default=SUMMARY_MAX_WORKERS)
+    parser.add_argument("--chunk-tokens", type=int, default=SUMMARY_CHUNK_TOKENS)
+    parser.add_argument("--context-tokens", type=int, default=128_000)
+    parser.add_argument("--ms-per-1k-input", type=float, default=150)
+    parser.add_argument("--ms-per-output-token", type=float, default=8)
+    args = parser.parse_args()
+
+    from cache import LRUBackend, ResultCache
+    from job_summary import estimate_tokens
+
+    rows = load_csv_rows()
+    text = "\n\n".join(
+        # numbered, so repeated fixture rows still make distinct chunks
+        f"Posting {i}: {row['title']} at {row['company']}\n{row['description']}"
+        for i, row in enumerate((rows * (args.jobs // len(rows) + 1))[:args.jobs], 1)
+    )
+    tokens = estimate_tokens(text)
+    print(f"input: {args.jobs} postings, ~{tokens:,} tokens")
+
+    def stub():
+        return StubBedrockClient(args.ms_per_1k_input, args.ms_per_output_token)
+
+    single = stub()
+    start = time.perf_counter()
+    single.invoke_model(modelId="stub", body=json.dumps({"messages": [{"role": "user", "content": text}]}))
+    note = "  (over the context window: the real model would reject it)" if tokens > args.context_tokens else ""
+    print(f"single call:      {time.perf_counter() - start:6.2f}s   1 call{note}")
+
+    client = stub()
+    summarizer = MapReduceSummarizer(
+        "stub", client=client, chunk_tokens=args.chunk_tokens, max_workers=args.workers,
+        cache=ResultCache(LRUBackend(), ttl=3600, namespace="chunk-summary"),
+    )
+    for label in ("map-reduce cold", "map-reduce warm"):
+        calls = client.calls
+        start = time.perf_counter()
+        summarizer.summarize(text)
+        print(f"{label}: {time.perf_counter() - start:6.2f}s   {client.calls - calls} calls, "
+              f"{args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
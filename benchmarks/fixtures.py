@@ -0,0 +1,235 @@
+"""
+HTML fixture corpus for offline scraper benchmarks.
+
+Layout under benchmarks/fixtures/:
+    jobPosting/<job_id>.html              jobs-guest jobPosting/{id} responses
+    search/<keywords-slug>/start-<n>.html seeMoreJobPostings/search responses
+
+Anything missing on disk is rendered from the checked-in CSVs with the same
+markup LinkedIn's guest API serves, so the corpus works out of the box.
+
+    python -m benchmarks.fixtures render
+        write the CSV-rendered corpus to disk (to inspect or edit it)
+    python -m benchmarks.fixtures record "Data Scientist" --pages 2
+        record real responses from LinkedIn into the corpus
+"""
+import argparse
+import csv
+import html
+import os
+import re
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(REPO_DIR, "benchmarks", "fixtures")
+# resolved from the repo, so the stand-in can be started from any directory
+CSV_FILES = [os.path.join(REPO_DIR, name) for name in ("data_scientist_jobs.csv", "Software_Developer_jobs.csv")]
+PAGE_SIZE = 25
+
+JOB_POSTING_TEMPLATE = """<!DOCTYPE html>
+<section class="top-card-layout container-lined overflow-hidden babybear:rounded-[0px]">
+  <div class="top-card-layout__entity-info-container flex flex-wrap papabear:flex-nowrap">
+    <div class="top-card-layout__entity-info flex-grow flex-shrink-0 basis-0 babybear:flex-none babybear:w-full babybear:flex-none babybear:w-full">
+      <h2 class="top-card-layout__title font-sans text-lg papabear:text-xl font-bold leading-open text-color-text mb-0 topcard__title">{title}</h2>
+      <h4 class="top-card-layout__second-subline font-sans text-sm leading-open text-color-text-low-emphasis mt-0.5">
+        <div class="topcard__flavor-row">
+          <span class="topcard__flavor">
+            <a href="https://www.linkedin.com/company/{company_slug}?trk=public_jobs_topcard-org-name" data-tracking-control-name="public_jobs_topcard-org-name" data-tracking-will-navigate class="topcard__org-name-link topcard__flavor--black-link">
+              {company}
+            </a>
+          </span>
+          <span class="topcard__flavor topcard__flavor--bullet">United States</span>
+        </div>
+      </h4>
+    </div>
+  </div>
+</section>
+<div class="decorated-job-posting__details">
+  <section class="core-section-container my-3 description">
+    <div class="core-section-container__content break-words">
+      <div class="description__text description__text--rich">
+        <section class="show-more-less-html" data-max-lines="5">
+          <div class="show-more-less-html__markup show-more-less-html__markup--clamp-after-5 relative overflow-hidden">
+            {description}
+          </div>
+        </section>
+      </div>
+    </div>
+  </section>
+</div>
+"""
+
+LISTING_CARD_TEMPLATE = """<li>
+  <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}" data-impression-id="jobs-search-result-{index}" data-reference-id="" data-tracking-id="">
+    <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" href="https://www.linkedin.com/jobs/view/{job_id}" data-tracking-control-name="public_jobs_jserp-result_search-card">
+      <span class="sr-only">{title}</span>
+    </a>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">{title}</h3>
+      <h4 class="base-search-card__subtitle">{company}</h4>
+    </div>
+  </div>
+</li>
+"""
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", (text or "").lower()).strip("-")
+
+
+def load_csv_rows(paths=CSV_FILES):
+    """Job rows from the checked-in CSVs, as dicts of strings."""
+    csv.field_size_limit(sys.maxsize)
+    rows = []
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def _description_markup(text):
+    """Spread a flat description over <p>/<br>/<strong> like a real posting."""
+    sentences = re.split(r"(?<=[.!?]) ", text)
+    paragraphs = []
+    for i in range(0, len(sentences), 3):
+        chunk = [html.escape(s) for s in sentences[i:i + 3]]
+        if chunk and i % 2 == 0:
+            chunk[0] = f"<strong>{chunk[0]}</strong>"
+        paragraphs.append("<p>" + "<br>\n".join(chunk) + "</p>")
+    return "\n            ".join(paragraphs)
+
+
+def render_job_posting(row):
+    """Render one CSV row as a jobs-guest ``jobPosting/{id}`` page."""
+    return JOB_POSTING_TEMPLATE.format(
+        title=html.escape(row["title"] or ""),
+        company=html.escape(row["company"] or ""),
+        company_slug=slugify(row["company"]),
+        description=_description_markup(row["description"] or ""),
+    )
+
+
+def render_listing_page(rows, start=0):
+    """Render rows as a ``seeMoreJobPostings/search`` page of job cards."""
+    return "".join(
+        LISTING_CARD_TEMPLATE.format(
+            job_id=row["job_id"],
+            index=start + i,
+            title=html.escape(row["title"] or ""),
+            company=html.escape(row["company"] or ""),
+        )
+        for i, row in enumerate(rows)
+    )
+
+
+class FixtureCorpus:
+    """Listing pages and job postings, recorded on disk or rendered from CSVs.
+
+    Searches for a role we have a CSV for ("data scientist",
+    "software developer") page through that CSV; any other keywords page
+    through every checked-in posting.
+    """
+
+    def __init__(self, directory=FIXTURE_DIR):
+        self.directory = directory
+        self.rows_by_role = {}
+        for path in CSV_FILES:
+            role = slugify(os.path.basename(path).replace("_jobs.csv", ""))
+            self.rows_by_role[role] = load_csv_rows([path])
+        self.all_rows = [row for rows in self.rows_by_role.values() for row in rows]
+        self._rows_by_id = {row["job_id"]: row for row in self.all_rows}
+
+    def _read(self, *parts):
+        path = os.path.join(self.directory, *parts)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        return None
+
+    def listing(self, keywords, start):
+        """Body of a search page; an empty string past the last page."""
+        slug = slugify(keywords)
+        recorded = self._read("search", slug, f"start-{start}.html")
+        if recorded is not None:
+            return recorded
+        rows = self.rows_by_role.get(slug, self.all_rows)
+        return render_listing_page(rows[start:start + PAGE_SIZE], start)
+
+    def posting(self, job_id):
+        """Body of a job posting, or None if the corpus doesn't have it."""
+        recorded = self._read("jobPosting", f"{job_id}.html")
+        if recorded is not None:
+            return recorded
+        row = self._rows_by_id.get(job_id)
+        return render_job_posting(row) if row else None
+
+    def job_ids(self):
+        return list(self._rows_by_id)
+
+
+def fixture_postings(directory=FIXTURE_DIR):
+    """Return ``{job_id: html}`` for every job-posting fixture."""
+    corpus = FixtureCorpus(directory)
+    postings = {job_id: corpus.posting(job_id) for job_id in corpus.job_ids()}
+    posting_dir = os.path.join(directory, "jobPosting")
+    if os.path.isdir(posting_dir):
+        for name in os.listdir(posting_dir):
+            if name.endswith(".html"):
+                postings.setdefault(name[:-len(".html")], corpus.posting(name[:-len(".html")]))
+    return postings
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def render_fixtures(directory=FIXTURE_DIR):
+    corpus = FixtureCorpus(directory)
+    for job_id in corpus.job_ids():
+        _write(os.path.join(directory, "jobPosting", f"{job_id}.html"), corpus.posting(job_id))
+    for role, rows in corpus.rows_by_role.items():
+        for start in range(0, len(rows), PAGE_SIZE):
+            _write(os.path.join(directory, "search", role, f"start-{start}.html"), corpus.listing(role, start))
+    print(f"Wrote {len(corpus.job_ids())} job postings and their listing pages to {directory}")
+
+
+def record_fixtures(role, location, pages, directory=FIXTURE_DIR):
+    """Save real LinkedIn responses for ``role`` into the corpus."""
+    import scraper
+
+    job_ids = []
+    for page in range(pages):
+        start = page * PAGE_SIZE
+        url = f"{scraper.BASE_URL}?keywords={role.replace(' ', '%20')}&location={location.replace(' ', '%20')}&start={start}"
+        res = scraper.http.get(url)
+        if res.status_code != 200:
+            print(f"⚠️ Skipped page {page} — status code {res.status_code}")
+            continue
+        _write(os.path.join(directory, "search", slugify(role), f"start-{start}.html"), res.text)
+        job_ids += re.findall(r'data-entity-urn="urn:li:jobPosting:(\d+)"', res.text)
+
+    saved = 0
+    for job_id in dict.fromkeys(job_ids):
+        page = scraper.fetch_job_html(job_id)
+        if page:
+            _write(os.path.join(directory, "jobPosting", f"{job_id}.html"), page[1])
+            saved += 1
+    print(f"Recorded {saved} postings for '{role}' into {directory}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("render")
+    record = sub.add_parser("record")
+    record.add_argument("role")
+    record.add_argument("--location", default="United States")
+    record.add_argument("--pages", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.command == "render":
+        render_fixtures()
+    else:
+        record_fixtures(args.role, args.location, args.pages)
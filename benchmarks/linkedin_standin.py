@@ -0,0 +1,142 @@
+"""
+Local stand-in for LinkedIn's jobs-guest API, served from the fixture corpus.
+
+    GET /jobs-guest/jobs/api/seeMoreJobPostings/search?keywords=..&start=..
+    GET /jobs-guest/jobs/api/jobPosting/<job_id>
+
+Latency, 5xx errors and 429 throttling are configurable so retry/backoff and
+concurrency can be exercised without touching linkedin.com. Responses carry
+an ETag and honour If-None-Match.
+
+    python -m benchmarks.linkedin_standin --port 8765 --latency-ms 150 --error-rate 0.02
+    LINKEDIN_HOST=http://127.0.0.1:8765 python check.py
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import hashlib
+import random
+import threading
+import time
+
+from benchmarks.fixtures import FixtureCorpus
+
+SEARCH_PATH = "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+POSTING_PREFIX = "/jobs-guest/jobs/api/jobPosting/"
+
+
+class StandinConfig:
+    def __init__(self, latency_ms=100, jitter_ms=50, error_rate=0.0, throttle_rate=0.0,
+                 max_requests_per_second=0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate  # share of requests answered with a 500
+        self.throttle_rate = throttle_rate  # share of requests answered with a 429
+        # hard 429 once more than this many requests arrive in one second (0 = off)
+        self.max_requests_per_second = max_requests_per_second
+        self.random = random.Random(seed)
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config=None, corpus=None):
+        super().__init__(address, StandinHandler)
+        self.config = config or StandinConfig()
+        self.corpus = corpus or FixtureCorpus()
+        self.stats = {"requests": 0, "200": 0, "304": 0, "404": 0, "429": 0, "500": 0}
+        self._lock = threading.Lock()
+        self._window = (0, 0)  # (second, requests in that second)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, status):
+        with self._lock:
+            self.stats[str(status)] = self.stats.get(str(status), 0) + 1
+
+    def over_limit(self):
+        limit = self.config.max_requests_per_second
+        with self._lock:
+            self.stats["requests"] += 1
+            second = int(time.monotonic())
+            seen = self._window[1] + 1 if self._window[0] == second else 1
+            self._window = (second, seen)
+        return bool(limit) and seen > limit
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real thing
+
+    def log_message(self, format, *args):
+        pass  # one line per request would swamp benchmark output
+
+    def do_GET(self):
+        server, config = self.server, self.server.config
+        with server._lock:
+            delay = max(0.0, config.latency_ms + config.random.uniform(-config.jitter_ms, config.jitter_ms))
+            roll = config.random.random()
+        time.sleep(delay / 1000)
+
+        if server.over_limit() or roll < config.throttle_rate:
+            return self._send(429, "", {"Retry-After": "1"})
+        if roll < config.throttle_rate + config.error_rate:
+            return self._send(500, "")
+
+        url = urlsplit(self.path)
+        if url.path == SEARCH_PATH:
+            query = parse_qs(url.query)
+            body = server.corpus.listing(query.get("keywords", [""])[0], int(query.get("start", ["0"])[0]))
+        elif url.path.startswith(POSTING_PREFIX):
+            body = server.corpus.posting(url.path[len(POSTING_PREFIX):])
+        else:
+            body = None
+        if body is None:
+            return self._send(404, "")
+
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, "", {"ETag": etag})
+        self._send(200, body, {"ETag": etag})
+
+    def _send(self, status, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+        self.server.count(status)
+
+
+def start_standin(config=None, host="127.0.0.1", port=0):
+    """Start a stand-in on a background thread; returns the server."""
+    server = StandinServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=int, default=0)
+    args = parser.parse_args()
+
+    config = StandinConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate, args.max_rps)
+    server = StandinServer((args.host, args.port), config)
+    print(f"LinkedIn stand-in serving on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(server.stats)
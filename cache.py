@@ -0,0 +1,439 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+import uuid
+
+from metrics import incr
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "dynamodb")  # memory | file | dynamodb
+# the runtime container's working directory is read-only
+CACHE_DIR = os.environ.get("CACHE_DIR", os.path.join(tempfile.gettempdir(), "cache"))
+LRU_MAX_ENTRIES = int(os.environ.get("CACHE_LRU_MAX_ENTRIES", "256"))
+DYNAMODB_TABLE_NAME = os.environ.get("DYNAMODB_TABLE_NAME", "Job-market-agent-db")
+# Point at DynamoDB Local (e.g. http://localhost:8000) to exercise the
+# DynamoDB backend offline.
+DYNAMODB_ENDPOINT_URL = os.environ.get("DYNAMODB_ENDPOINT_URL")
+# Coalesce identical scrapes across containers with a lease item in the
+# DynamoDB table (in-process coalescing is always on).
+CACHE_LEASE_ENABLED = os.environ.get("CACHE_LEASE_ENABLED", "0") == "1"
+CACHE_LEASE_SECONDS = int(os.environ.get("CACHE_LEASE_SECONDS", str(5 * 60)))  # longer than a scrape
+CACHE_LEASE_POLL_SECONDS = 2
+
+
+def make_cache_key(role, location, pages):
+    """Normalize a scrape request into a stable cache key.
+
+    "Data  Scientist", "data scientist" and " DATA SCIENTIST " all share one
+    entry.
+    """
+
+    def norm(value):
+        return re.sub(r"\s+", " ", str(value)).strip().lower()
+
+    return f"{norm(role)}|{norm(location)}|{int(pages)}"
+
+
+# --------------------------------
+# BACKENDS
+# --------------------------------
+# Every backend stores (value, stored_at) pairs. ``value`` must be
+# JSON-serializable; ``stored_at`` is a unix timestamp. Freshness is decided by
+# ResultCache, not by the backends.
+
+
+class LRUBackend:
+    """In-process, size-bounded cache. Lost on restart."""
+
+    def __init__(self, max_entries=LRU_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at):
+        with self._lock:
+            self._items[key] = (value, stored_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+
+class FileBackend:
+    """One JSON file per key under ``directory``. Survives restarts."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, key):
+        slug = re.sub(r"[^a-z0-9]+", "_", key.lower()).strip("_")[:60]
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+        return os.path.join(self.directory, f"{slug}-{digest}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("key") != key:
+            return None
+        return data["value"], data["timestamp"]
+
+    def set(self, key, value, stored_at):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # write to a temp file and rename so readers never see half a file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"key": key, "timestamp": stored_at, "value": value}, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class DynamoDBBackend:
+    """Items in the agent's DynamoDB table, keyed on ``role``.
+
+    The table (or a moto/DynamoDB Local stand-in) can be injected directly;
+    otherwise it is created lazily from the table name and region.
+    """
+
+    def __init__(
+        self,
+        table_name=DYNAMODB_TABLE_NAME,
+        region=None,
+        endpoint_url=DYNAMODB_ENDPOINT_URL,
+        table=None,
+        key_attribute="role",
+        expire_after=None,
+    ):
+        self.table_name = table_name
+        self.region = region or os.environ.get("AWS_REGION")
+        self.endpoint_url = endpoint_url
+        self.key_attribute = key_attribute
+        # seconds after stored_at at which DynamoDB TTL may delete the item
+        self.expire_after = expire_after
+        self._table = table
+        self._lock = threading.Lock()
+
+    @property
+    def table(self):
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    import boto3
+
+                    dynamodb = boto3.resource(
+                        "dynamodb", region_name=self.region, endpoint_url=self.endpoint_url
+                    )
+                    self._table = dynamodb.Table(self.table_name)
+        return self._table
+
+    def get(self, key):
+        response = self.table.get_item(Key={self.key_attribute: key})
+        item = response.get("Item")
+        if not item or "payload" not in item:
+            return None
+        return json.loads(item["payload"]), int(item.get("timestamp", 0))
+
+    def set(self, key, value, stored_at):
+        item = {
+            self.key_attribute: key,
+            "timestamp": int(stored_at),
+            "payload": json.dumps(value),
+        }
+        if self.expire_after:
+            item["expires_at"] = int(stored_at + self.expire_after)
+        self.table.put_item(Item=item)
+
+    def delete(self, key):
+        self.table.delete_item(Key={self.key_attribute: key})
+
+
+class DynamoDBLease:
+    """Cross-container mutex stored as ``lease:<key>`` items in a DynamoDB table.
+
+    Acquired with a conditional put that only succeeds if no live lease
+    exists; an expired lease (its holder crashed) can be taken over. Items
+    carry ``expires_at`` so DynamoDB TTL cleans up after crashed holders.
+    """
+
+    def __init__(self, backend, lease_seconds=CACHE_LEASE_SECONDS):
+        self.backend = backend
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def _item_key(self, key):
+        return {self.backend.key_attribute: f"lease:{key}"}
+
+    def acquire(self, key):
+        """Take the lease on ``key``; returns False while someone else holds it."""
+        from botocore.exceptions import ClientError
+
+        now = int(time.time())
+        try:
+            self.backend.table.put_item(
+                Item={
+                    **self._item_key(key),
+                    "owner": self.owner,
+                    "lease_expires_at": now + self.lease_seconds,
+                    "expires_at": now + self.lease_seconds,
+                },
+                ConditionExpression="attribute_not_exists(#k) OR lease_expires_at < :now",
+                ExpressionAttributeNames={"#k": self.backend.key_attribute},
+                ExpressionAttributeValues={":now": now},
+            )
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+
+    def release(self, key):
+        """Drop the lease on ``key`` if we still hold it."""
+        from botocore.exceptions import ClientError
+
+        try:
+            self.backend.table.delete_item(
+                Key=self._item_key(key),
+                ConditionExpression="#o = :owner",
+                ExpressionAttributeNames={"#o": "owner"},
+                ExpressionAttributeValues={":owner": self.owner},
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+
+def make_lease(backend, enabled=CACHE_LEASE_ENABLED):
+    """A DynamoDBLease on ``backend``'s table, or None if leases are off or unsupported."""
+    if not enabled:
+        return None
+    if not isinstance(backend, DynamoDBBackend):
+        print("[CACHE LOG] CACHE_LEASE_ENABLED needs the dynamodb backend; coalescing in-process only")
+        return None
+    return DynamoDBLease(backend)
+
+
+def make_backend(name=CACHE_BACKEND, **kwargs):
+    """Build a backend from its config name: memory, file or dynamodb."""
+    backends = {
+        "memory": LRUBackend,
+        "file": FileBackend,
+        "dynamodb": DynamoDBBackend,
+    }
+    if name not in backends:
+        raise ValueError(f"Unknown cache backend '{name}', expected one of {sorted(backends)}")
+    return backends[name](**kwargs)
+
+
+# --------------------------------
+# RESULT CACHE
+# --------------------------------
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            print(f"[CACHE LOG] Joining in-flight computation of '{key}'")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+
+class ResultCache:
+    """TTL cache with stale-while-revalidate on top of any backend.
+
+    - age < ``ttl``: fresh hit, returned as-is
+    - age < ``ttl + stale_ttl``: stale hit, returned immediately while one
+      background thread recomputes it
+    - older or missing: computed inline and stored
+
+    Concurrent computations of one key are coalesced: in-process always,
+    and across processes too when a ``lease`` (see DynamoDBLease) is given.
+
+    Backend errors are logged and treated as a miss, so a broken cache never
+    breaks the tool that uses it.
+    """
+
+    def __init__(self, backend, ttl, stale_ttl=0, namespace="", lease=None):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.namespace = namespace
+        self.lease = lease
+        self._flights = SingleFlight()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}" if self.namespace else key
+
+    def get_entry(self, key):
+        """Return ``(value, stored_at)`` regardless of age, or None."""
+        try:
+            return self.backend.get(self._key(key))
+        except Exception as e:
+            print(f"[CACHE ERROR] get '{key}' failed: {e}")
+            return None
+
+    def get(self, key):
+        """Return the value if it is still fresh, else None."""
+        entry = self.get_entry(key)
+        if entry and time.time() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def set(self, key, value):
+        try:
+            self.backend.set(self._key(key), value, time.time())
+        except Exception as e:
+            print(f"[CACHE ERROR] set '{key}' failed: {e}")
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing it if needed.
+
+        ``compute`` returning None means "nothing worth caching"; that result
+        is passed through but not stored.
+        """
+        entry = self.get_entry(key)
+        if entry:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                print(f"[CACHE LOG] Cache HIT for '{key}'")
+                incr("cache", namespace=self.namespace or "default", result="hit")
+                return value
+            if age < self.ttl + self.stale_ttl:
+                print(f"[CACHE LOG] Cache STALE for '{key}', revalidating in background")
+                incr("cache", namespace=self.namespace or "default", result="stale")
+                self._refresh_in_background(key, compute)
+                return value
+        print(f"[CACHE LOG] Cache MISS for '{key}'")
+        incr("cache", namespace=self.namespace or "default", result="miss")
+        return self.refresh(key, compute, unless_fresh=True)
+
+    def refresh(self, key, compute, unless_fresh=False):
+        """Recompute ``key`` now and store it, whatever the age of its entry.
+
+        Callers refreshing the same key at the same time share one
+        ``compute``. With ``unless_fresh``, a fresh value stored by someone
+        else since the caller last looked is returned instead.
+        """
+
+        def run():
+            if unless_fresh:
+                value = self.get(key)
+                if value is not None:
+                    return value
+            if self.lease is None:
+                return self._compute_and_store(key, compute)
+            return self._compute_under_lease(key, compute)
+
+        return self._flights.do(self._key(key), run)
+
+    def _compute_and_store(self, key, compute):
+        value = compute()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def _compute_under_lease(self, key, compute):
+        """Compute while holding the lease, or wait for the holder's result."""
+        # backends may store whole seconds only
+        lease_key, started, waiting = self._key(key), int(time.time()), False
+        while True:
+            try:
+                acquired = self.lease.acquire(lease_key)
+            except Exception as e:
+                print(f"[CACHE ERROR] lease on '{key}' failed, computing anyway: {e}")
+                return self._compute_and_store(key, compute)
+            if acquired:
+                try:
+                    return self._compute_and_store(key, compute)
+                finally:
+                    try:
+                        self.lease.release(lease_key)
+                    except Exception as e:
+                        print(f"[CACHE ERROR] releasing lease on '{key}' failed: {e}")
+
+            if not waiting:
+                print(f"[CACHE LOG] '{key}' is being computed elsewhere, waiting")
+                waiting = True
+            time.sleep(CACHE_LEASE_POLL_SECONDS)
+            entry = self.get_entry(key)
+            if entry and entry[1] >= started:
+                return entry[0]
+            # otherwise retry: the holder may have finished with nothing to
+            # store, or died and let its lease expire
+
+    def _refresh_in_background(self, key, compute):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def revalidate():
+            try:
+                self.refresh(key, compute, unless_fresh=True)
+            except Exception as e:
+                print(f"[CACHE ERROR] background refresh of '{key}' failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=revalidate, daemon=True).start()
@@ -0,0 +1,257 @@
+"""
+Near-duplicate detection for job postings (shingling + MinHash/LSH).
+
+The same position is often reposted under a new job_id, and staffing
+agencies post one description many times. Counting each copy inflates skill
+counts and resends the same text to the model, so every posting is
+classified against the ones seen before it:
+
+    shingles    overlapping DEDUP_SHINGLE_WORDS-word runs of the normalized
+                description, hashed to 32 bits
+    signature   DEDUP_NUM_PERM MinHash values; the share of equal values
+                between two signatures estimates the shingle sets' Jaccard
+                similarity
+    LSH         the signature is cut into DEDUP_BANDS bands. Postings that
+                share any band are candidates; only those are compared, so
+                a lookup costs a few dict probes however many postings are
+                indexed
+
+A posting whose estimated similarity to an indexed one reaches
+DEDUP_THRESHOLD joins its cluster; otherwise it starts a new one. Each
+scrape (ScrapeDedup) keeps the first posting it sees of every cluster and
+drops the rest, so a cluster counts once per scrape, whether or not its
+first posting was seen by an earlier run.
+
+Cluster assignments are appended to
+``<job store>/_dedup/<role-slug>-<params>.jsonl`` and reloaded on the next
+run, so a job_id keeps its cluster across runs.
+"""
+import base64
+from functools import lru_cache
+import json
+import os
+import re
+import threading
+import zlib
+
+from job_store import job_store, role_slug
+from metrics import incr, span
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+DEDUP_ENABLED = os.environ.get("DEDUP_ENABLED", "1") == "1"
+DEDUP_SHINGLE_WORDS = 5
+DEDUP_NUM_PERM = 128
+# DEDUP_NUM_PERM / DEDUP_BANDS rows per band. 32 bands of 4 make two postings
+# at 0.8 similarity candidates with ~99.9% probability, at 0.3 with ~23%.
+DEDUP_BANDS = 32
+# estimated Jaccard similarity of the shingle sets at which postings are merged
+DEDUP_THRESHOLD = float(os.environ.get("DEDUP_THRESHOLD", "0.8"))
+# fixed so signatures written by earlier runs stay comparable
+DEDUP_SEED = 1
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def shingles(text, size=DEDUP_SHINGLE_WORDS):
+    """32-bit hashes of the ``size``-word runs of ``text``, case and punctuation folded."""
+    words = _WORD.findall((text or "").lower())
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+@lru_cache(maxsize=None)
+def _permutations(num_perm, seed):
+    import numpy as np
+
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash(hashes, num_perm=DEDUP_NUM_PERM, seed=DEDUP_SEED):
+    """MinHash signature (uint32 array of ``num_perm``) of a set of shingle hashes."""
+    import numpy as np
+
+    a, b = _permutations(num_perm, seed)
+    if not hashes:
+        return np.full(num_perm, _MAX_HASH, dtype=np.uint32)
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    # (a * x + b) mod p per permutation, for every shingle at once; the
+    # uint64 product wraps, which keeps the values well mixed
+    permuted = ((np.outer(values, a) + b) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+class DedupIndex:
+    """LSH index of posting signatures with a persistent job_id -> cluster map.
+
+    ``path`` is the JSON-lines file decisions are appended to; with None the
+    index lives in memory only.
+    """
+
+    def __init__(self, path=None, threshold=DEDUP_THRESHOLD, num_perm=DEDUP_NUM_PERM, bands=DEDUP_BANDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.canonical_of = {}  # job_id -> canonical job_id (itself for canonical postings)
+        self._signatures = {}  # canonical job_id -> signature
+        self._buckets = [{} for _ in range(bands)]  # per band: band bytes -> [canonical job_ids]
+        self._lock = threading.Lock()
+        self._append_failed = False
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        import numpy as np
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError as e:
+            print(f"[DEDUP ERROR] reading {self.path} failed, starting empty: {e}")
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash mid-write
+            if "sig" in entry:
+                signature = np.frombuffer(base64.b64decode(entry["sig"]), dtype=np.uint32)
+                self._index(entry["id"], signature)
+            else:
+                self.canonical_of[entry["id"]] = entry["dup"]
+        print(f"[DEDUP LOG] Loaded {len(self.canonical_of)} postings "
+              f"({len(self._signatures)} clusters) from {self.path}")
+
+    def _append(self, entry):
+        """Persist one decision; on failure it is kept in memory only."""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            if not self._append_failed:  # once, not for every posting of a scrape
+                print(f"[DEDUP ERROR] persisting to {self.path} failed, keeping decisions in memory: {e}")
+            self._append_failed = True
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _index(self, job_id, signature):
+        self.canonical_of[job_id] = job_id
+        self._signatures[job_id] = signature
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(job_id)
+
+    def _best_match(self, signature):
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        best, best_similarity = None, self.threshold
+        for candidate in candidates:
+            similarity = float((self._signatures[candidate] == signature).mean())
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        return best
+
+    def canonical(self, job_id, text):
+        """job_id of the canonical posting in ``job_id``'s cluster, classifying it if new."""
+        job_id = str(job_id)
+        with self._lock:
+            known = self.canonical_of.get(job_id)
+        if known is not None:
+            return known
+
+        hashes = shingles(text)
+        if not hashes:
+            return job_id  # nothing to compare; never merge empty descriptions
+        with span("dedup.minhash"):
+            signature = minhash(hashes, self.num_perm)
+        with self._lock:
+            known = self.canonical_of.get(job_id)  # classified by another thread meanwhile
+            if known is not None:
+                return known
+            match = self._best_match(signature)
+            if match is None:
+                self._index(job_id, signature)
+                self._append({"id": job_id, "sig": base64.b64encode(signature.tobytes()).decode("ascii")})
+                return job_id
+            self.canonical_of[job_id] = match
+            self._append({"id": job_id, "dup": match})
+            return match
+
+    def unique(self, jobs, dropped=None):
+        """``jobs`` as one scrape: see ScrapeDedup.unique."""
+        return ScrapeDedup(self).unique(jobs, dropped)
+
+
+class ScrapeDedup:
+    """Keeps the first posting of each cluster seen during one scrape.
+
+    The index only says which cluster a posting belongs to. Whether it is
+    dropped depends on this scrape alone: a repost whose original was seen
+    in an earlier run (and may have expired since) still counts, once.
+    ``index`` None lets everything through.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.clusters = set()
+        self.dropped = []
+
+    def is_duplicate(self, job):
+        """True when a posting of ``job``'s cluster was already kept by this scrape."""
+        if self.index is None:
+            return False
+        cluster = self.index.canonical(job.get("job_id"), job.get("description"))
+        duplicate = cluster in self.clusters
+        self.clusters.add(cluster)
+        incr("dedup", result="duplicate" if duplicate else "unique")
+        return duplicate
+
+    def unique(self, jobs, dropped=None):
+        """Yield the jobs in ``jobs`` that are not near-duplicates of one kept before.
+
+        Dropped jobs are collected in ``self.dropped`` and, when it is given,
+        appended to ``dropped``.
+        """
+        for job in jobs:
+            if not self.is_duplicate(job):
+                yield job
+                continue
+            self.dropped.append(job)
+            if dropped is not None:
+                dropped.append(job)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def dedup_index(role, store=None):
+    """The persistent DedupIndex for ``role`` next to ``store``'s data, loaded once per process."""
+    # the parameters are part of the name: signatures made with others don't compare
+    name = f"{role_slug(role)}-w{DEDUP_SHINGLE_WORDS}-p{DEDUP_NUM_PERM}-s{DEDUP_SEED}.jsonl"
+    path = os.path.join((store or job_store).directory, "_dedup", name)
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = DedupIndex(path)
+        return _indexes[path]
+
+
+def scrape_dedup(role, store=None):
+    """A ScrapeDedup for one scrape of ``role``; lets everything through when DEDUP_ENABLED is off."""
+    return ScrapeDedup(dedup_index(role, store) if DEDUP_ENABLED else None)
@@ -0,0 +1,168 @@
+from collections import OrderedDict, namedtuple
+from urllib.parse import urlsplit
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import incr
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# status_code is 200 for a revalidated (304) response; not_modified tells the
+# two apart so callers can count what actually came over the wire.
+HttpResult = namedtuple("HttpResult", ["status_code", "text", "not_modified"])
+
+
+class RateLimiter:
+    """Spaces requests to the same host at least ``1 / rate`` seconds apart.
+
+    One instance is shared by every worker thread, so concurrent fetches use
+    the same request budget the old ``time.sleep(1)`` loop did, but spend the
+    wait overlapping other requests instead of idling.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """Block until a request to ``url``'s host is allowed."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HttpClient:
+    """Pooled, retrying GET client shared by all scraper threads.
+
+    - one ``requests.Session`` so TCP/TLS connections are kept alive and reused
+    - exponential backoff with full jitter on 429/5xx and connection errors,
+      honouring ``Retry-After`` when the server sends one
+    - ETag / Last-Modified revalidation: a 304 is answered from the body we
+      already have instead of downloading the page again. Bodies are kept
+      for at most ``validator_cache_size`` URLs and ``validator_cache_bytes``
+      bytes, least recently used dropped first
+    """
+
+    def __init__(
+        self,
+        pool_size=10,
+        max_retries=3,
+        backoff_base=1.0,
+        backoff_max=30.0,
+        timeout=15,
+        rate_limiter=None,
+        validator_cache_size=2048,
+        validator_cache_bytes=32 * 1024 * 1024,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.validator_cache_size = validator_cache_size
+        self.validator_cache_bytes = validator_cache_bytes
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._validators = OrderedDict()  # url -> (etag, last_modified, text, size in bytes)
+        self._validator_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """GET ``url`` and return an ``HttpResult``.
+
+        Raises the last connection error if every attempt failed without a
+        response; otherwise returns the final response, even if it is not 200.
+        """
+        headers = self._conditional_headers(url)
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.wait(url)
+            try:
+                res = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                incr("http.errors", error=type(e).__name__)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            incr("http.status", code=res.status_code)
+            if res.status_code == 304:
+                cached = self._from_cache(url)
+                if cached:
+                    return cached
+                if headers:
+                    # validator was evicted meanwhile; ask for the full page
+                    # again, which is not a retry and costs no attempt
+                    headers = {}
+                    continue
+            if res.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                print(f"⚠️ {res.status_code} from {url} — retry {attempt + 1}/{self.max_retries}")
+                time.sleep(self._backoff(attempt, res.headers.get("Retry-After")))
+                attempt += 1
+                continue
+            if res.status_code == 200:
+                self._remember(url, res)
+            return HttpResult(res.status_code, res.text, False)
+
+    def _backoff(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.backoff_max, float(retry_after)))
+        return delay
+
+    def _conditional_headers(self, url):
+        with self._lock:
+            cached = self._validators.get(url)
+        if not cached:
+            return {}
+        etag, last_modified, _, _ = cached
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _remember(self, url, res):
+        etag = res.headers.get("ETag")
+        last_modified = res.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        size = len(res.content)
+        if size > self.validator_cache_bytes:
+            return
+        with self._lock:
+            old = self._validators.pop(url, None)
+            if old:
+                self._validator_bytes -= old[3]
+            self._validators[url] = (etag, last_modified, res.text, size)
+            self._validator_bytes += size
+            # bounded by count and by the bytes of the bodies kept
+            while (len(self._validators) > self.validator_cache_size
+                   or self._validator_bytes > self.validator_cache_bytes):
+                _, evicted = self._validators.popitem(last=False)
+                self._validator_bytes -= evicted[3]
+
+    def _from_cache(self, url):
+        with self._lock:
+            cached = self._validators.get(url)
+            if not cached:
+                return None
+            self._validators.move_to_end(url)
+        return HttpResult(200, cached[2], True)
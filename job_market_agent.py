@@ -1,23 +1,38 @@
-import pandas as pd
-from bs4 import BeautifulSoup
-import requests
-import re
-from datetime import datetime
-import time
 import os
-from strands import Agent, tool
-from bedrock_agentcore.memory.integrations.strands.config import (
-    AgentCoreMemoryConfig,
-    RetrievalConfig,
+# strands, the AgentCore memory integration, pyarrow and pandas are imported
+# on first use (see _build_agent and runtime_cache.preload_modules), so the
+# container answers /ping without waiting for them.
+from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from metrics import PROFILER_ENABLED, TRACE_RESPONSES, metrics, profiler, span, timed, trace_scope
+from request_context import (
+    current_request,
+    emit_event,
+    request_from_context,
+    request_scope,
+    stream_callback_handler,
+    stream_events,
+    streaming,
 )
-from bedrock_agentcore.memory.integrations.strands.session_manager import (
-    AgentCoreMemorySessionManager,
+from runtime_cache import (
+    AGENT_CACHE_MAX_ENTRIES,
+    AGENT_IDLE_SECONDS,
+    CachedAgent,
+    IdleCache,
+    StageTimingHooks,
+    close_cached_agent,
+    get_bedrock_model,
+    preload_modules,
+    strands_tools,
+    timed_memory_retrieval,
 )
-from bedrock_agentcore.tools.code_interpreter_client import CodeInterpreter
-from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from datetime import datetime, timedelta
-import json
-import boto3
+from cache import CACHE_BACKEND, ResultCache, make_backend, make_cache_key, make_lease
+from job_summary import DEFAULT_TOKEN_BUDGET, query_corpus, render_summary, summarize_jobs
+from skill_trends import render_skill_trend, render_top_skills, skill_trends
+from skills import SkillTally, get_skill_matcher
+from prewarm import PREWARM_ENABLED, Prewarmer
+from job_store import JobStoreSink, job_store
+from dedup import scrape_dedup
+from scraper import LOCATION, MAX_PAGES, PAGE_SIZE, iter_jobs
 
 
 app = BedrockAgentCoreApp()
@@ -27,201 +42,45 @@ REGION = os.getenv("AWS_REGION")
 MODEL_ID = (
     "arn:aws:bedrock:us-east-2:746630811346:inference-profile/us.amazon.nova-micro-v1:0"
 )
-bedrock_client = boto3.client('bedrock-runtime', region_name=REGION)
-ci_sessions = {}
-CACHE_TTL_DAYS = 1
-CACHE_DIR = "cache/"
-
-current_session = None
-memory_session_manager = None  # store globally
 
 # --------------------------------
 # CONFIG
 # --------------------------------
-BASE_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-ROLE = "Data Scientist"
-LOCATION = "United States"
-MAX_PAGES = 2  # scrape first 5 pages
-OUTPUT_FILE = "data_scientist_jobs.csv"
-
-DYNAMODB_TABLE_NAME = os.environ.get("DYNAMODB_TABLE_NAME", "Job-market-agent-db")
+# Imported in the background once the server is up; the first request would
+# otherwise pay for them (strands alone takes about half a second).
+PRELOAD_MODULES = [
+    "strands",
+    "bedrock_agentcore.memory.integrations.strands.session_manager",
+    "bs4",
+    "pyarrow.dataset",
+    "pyarrow.parquet",
+    "skill_matrix",
+]
 CACHE_DURATION_SECONDS = 5 * 24 * 60 * 60  # 5 days
-
-# --- NEW: Initialize Boto3 clients ---
-dynamodb = boto3.resource('dynamodb', region_name=REGION)
-cache_table = dynamodb.Table(DYNAMODB_TABLE_NAME)
-
-
-# --------------------------------
-# HELPER FUNCTIONS
-# --------------------------------
-
-
-def get_job_listings(role, location, pages=1):
-    """Fetch job IDs from LinkedIn guest job listings."""
-    job_ids = []
-
-    for page in range(pages):
-        start = page * 25
-        url = f"{BASE_URL}?keywords={role.replace(' ', '%20')}&location={location.replace(' ', '%20')}&start={start}"
-        print(f"Fetching: {url}")
-        response = requests.get(url)
-        if response.status_code != 200:
-            print(f"⚠️ Skipped page {page} — status code {response.status_code}")
-            continue
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        for li in soup.find_all("li"):
-            div = li.find("div", {"class": "base-card"})
-            if div and div.get("data-entity-urn"):
-                job_id = div["data-entity-urn"].split(":")[-1]
-                job_ids.append(job_id)
-
-        time.sleep(1)  # avoid hitting LinkedIn too fast
-    return job_ids
-
-
-def get_job_details(job_id):
-    """Fetch full job details from a given job_id."""
-    job_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-    res = requests.get(job_url)
-    if res.status_code != 200:
-        return None
-
-    soup = BeautifulSoup(res.text, "html.parser")
-
-    def extract_text(selector, class_name):
-        tag = soup.find(selector, {"class": class_name})
-        return tag.text.strip() if tag else None
-
-    job = {
-        "job_id": job_id,
-        "title": extract_text("h2", "top-card-layout__title"),
-        "company": extract_text("a", "topcard__org-name-link"),
-        "description": clean_html(
-            str(soup.find("div", {"class": "show-more-less-html__markup"}))
-        ),
-        "url": f"https://www.linkedin.com/jobs/view/{job_id}",
-        "fetched_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-    }
-    return job
-
-
-def clean_html(text):
-    """Remove HTML tags and clean up whitespace."""
-    if not text:
-        return ""
-    soup = BeautifulSoup(text, "html.parser")
-    clean_text = soup.get_text(" ")
-    clean_text = re.sub(r"\s+", " ", clean_text).strip()
-    return clean_text
-
-
-def scrape_jobs(role=ROLE, location=LOCATION, pages=MAX_PAGES):
-    """Scrape and compile job data."""
-    job_ids = get_job_listings(role, location, pages)
-    print(f"Found {len(job_ids)} job IDs")
-
-    jobs = []
-    for jid in job_ids:
-        job = get_job_details(jid)
-        if job:
-            jobs.append(job)
-        time.sleep(1)
-    return jobs
-
-
-def save_to_csv(jobs, file_name):
-    df = pd.DataFrame(jobs)
-    df.drop_duplicates(subset="job_id", inplace=True)
-    df.to_csv(file_name, index=False)
-    print(f"✅ Saved {len(df)} jobs to {file_name}")
-
-
-def load_from_cache(role):
-    path = f"{CACHE_DIR}/{role.replace(' ', '_')}.json"
-    if os.path.exists(path):
-        with open(path) as f:
-            data = json.load(f)
-            if datetime.now() - datetime.fromisoformat(data["timestamp"]) < timedelta(
-                days=30
-            ):
-                return data["jobs"]
-    return None
-
-import re
-
-def extract_skills_from_jobs(jobs_list: list) -> dict:
-    """
-    Extracts and counts predefined skills from a list of job dictionaries.
-
-    Args:
-        jobs_list: A list of 'job' dictionaries, where each dict is expected
-                   to have a 'description' key with a string value.
-
-    Returns:
-        A dictionary where keys are standardized skill names (e.g., "Python")
-        and values are the count of jobs mentioning that skill.
-    """
-    
-    # --- Your Skill Database ---
-    SKILL_DATABASE = {
-        "Python": ['python'],
-        "Java": ['java'],
-        "JavaScript": ['javascript', 'js'],
-        "SQL": ['sql'],
-        "R": [r'\b r\b'],
-        "C++": ['c++', 'cpp'],
-        "C#": ['c#', 'csharp'],
-        "AWS": ['aws', 'amazon web services'],
-        "Azure": ['azure'],
-        "Google Cloud (GCP)": ['gcp', 'google cloud'],
-        "Tableau": ['tableau'],
-        "Power BI": ['power bi', 'powerbi'],
-        "Spark": ['spark', 'apache spark'],
-        "Pandas": ['pandas'],
-        "NumPy": ['numpy'],
-        "Excel": ['excel'],
-        "React": ['react'],
-        "Node.js": ['node.js', 'nodejs'],
-        "Docker": ['docker'],
-        "Kubernetes": ['kubernetes', 'k8s'],
-        "Git": ['git'],
-        "Agile": ['agile', 'scrum'],
-    }
-
-    skill_counts = {}
-    
-    if not isinstance(jobs_list, list):
-        print("Error: Input must be a list of job dictionaries.")
-        return {}
-
-    # --- This is the key change ---
-    for job in jobs_list:
-        if not isinstance(job, dict):
-            continue  # Skip any item that isn't a dictionary
-        
-        # Get the description string from the job dictionary
-        desc = job.get("description")
-
-        if not desc or not isinstance(desc, str):
-            continue # Skip if description is missing or not a string
-            
-        skills_found_in_this_job = set()
-
-        for skill_name, keywords in SKILL_DATABASE.items():
-            for keyword in keywords:
-                # Search for the keyword as a whole word, ignoring case
-                if re.search(r'\b' + re.escape(keyword) + r'\b', desc, re.IGNORECASE):
-                    skills_found_in_this_job.add(skill_name)
-                    break 
-        
-        # Update the master count
-        for skill in skills_found_in_this_job:
-            skill_counts[skill] = skill_counts.get(skill, 0) + 1
-
-    return skill_counts
-
+# Past the TTL a cached summary is still served for this long while a
+# background scrape refreshes it.
+CACHE_STALE_SECONDS = 2 * 24 * 60 * 60  # 2 days
+
+# Full scraped postings stay server-side; the agent only sees a bounded
+# summary and reads postings back through query_job_postings. They are too
+# large for a DynamoDB item, so they get their own (file by default) store.
+CORPUS_BACKEND = os.environ.get("CORPUS_BACKEND", "file")
+
+# Concurrent scrapes of the same role share one run: in-process always,
+# across containers when CACHE_LEASE_ENABLED=1 (DynamoDB lease item).
+summary_backend = make_backend(CACHE_BACKEND)
+result_cache = ResultCache(
+    summary_backend,
+    ttl=CACHE_DURATION_SECONDS,
+    stale_ttl=CACHE_STALE_SECONDS,
+    namespace="summary",
+    lease=make_lease(summary_backend),
+)
+corpus_store = ResultCache(
+    make_backend(CORPUS_BACKEND),
+    ttl=CACHE_DURATION_SECONDS + CACHE_STALE_SECONDS,
+    namespace="corpus",
+)
 
 
 # @tool
@@ -231,127 +90,258 @@ def extract_skills_from_jobs(jobs_list: list) -> dict:
 #     save_to_csv(jobs, f"{role.replace(' ', '_')}_jobs.csv")
 #     return f"Scraped and saved {len(jobs)} {role} postings."
 
-@tool
-def scrape_and_extract_skills(role: str) -> str:
+def scrape_and_extract_skills(role: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
     """
     Scrapes job postings for a specific role, extracts the most common 
     skills from the descriptions, and returns a summary of those skills.
     This tool caches results for 5 days to avoid re-scraping.
 
+    The summary lists ranked skill counts with percentages, top titles and
+    companies and a few excerpts. It ends with a handle for
+    query_job_postings, which reads the full postings if more detail is needed.
+
     :param role: The job title or keyword to search for (e.g., 'data scientist').
+    :param token_budget: Rough upper bound on the size of the returned summary, in tokens.
     :return: A string summarizing the job count and top skills found.
     """
-    global current_session
-    session_id = current_session or 'default'
-    print(f"[TOOL LOG] 'scrape_and_extract_skills' CALLED for role '{role}'")
-    
-    # Standardize the role key for caching (e.g., "data analyst")
-    # cache_key = role.lower().strip()
-    # current_time = int(time.time())
-
-    # try:
-        # --- 1. CHECK CACHE FIRST ---
-        # print(f"[CACHE LOG] Checking DynamoDB table '{DYNAMODB_TABLE_NAME}' for key '{cache_key}'")
-        # cache_response = cache_table.get_item(Key={'role': cache_key})
-        
-        # if 'Item' in cache_response:
-        #     item = cache_response['Item']
-        #     item_timestamp = int(item.get('timestamp', 0))
-            
-        #     # Check if cache is still valid
-        #     if (current_time - item_timestamp) < CACHE_DURATION_SECONDS:
-        #         print("[CACHE LOG] Cache HIT. Returning cached data.")
-        #         return item['skills_summary']
-        #     else:
-        #         print("[CACHE LOG] Cache STALE. Proceeding to scrape.")
-        # else:
-        #     print("[CACHE LOG] Cache MISS. Proceeding to scrape.")
-
-        # # --- 2. CACHE MISS/STALE: RUN THE REAL LOGIC ---
-    print("[TOOL LOG] Scraping and extracting new data...")
-    jobs = scrape_jobs(role=role)
-    job_count = len(jobs)
-    
-    if not jobs:
+    session_id = current_request().session_id
+    print(f"[TOOL LOG] 'scrape_and_extract_skills' CALLED for role '{role}' (session {session_id})")
+
+    prewarmer.record(role)
+    cache_key = make_cache_key(role, LOCATION, MAX_PAGES)
+    summary = result_cache.get_or_compute(cache_key, lambda: _scrape_and_summarize(role, cache_key))
+    if summary is None:
         return f"No job postings found for the role: {role}."
-    print(jobs)
-    skills = extract_skills_from_jobs(jobs)
-    if not skills:
-        return f"Found {job_count} jobs for '{role}', but could not extract any common skills."
+    return render_summary(summary, token_budget)
+
+
+def query_job_postings(
+    handle: str,
+    skill: str = "",
+    company: str = "",
+    keyword: str = "",
+    offset: int = 0,
+    limit: int = 5,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """
+    Reads the full job postings behind a handle returned by
+    scrape_and_extract_skills, filtered by skill, company and/or keyword.
+    Use it only when the summary is not enough to answer.
+
+    :param handle: The handle from a scrape_and_extract_skills summary.
+    :param skill: Only postings mentioning this skill (e.g. 'Kubernetes').
+    :param company: Only postings from companies whose name contains this.
+    :param keyword: Only postings whose description contains this text.
+    :param offset: Number of matching postings to skip, for paging (0 or more).
+    :param limit: Maximum number of postings to return (at most 20).
+    :param token_budget: Rough upper bound on the size of the result, in tokens.
+    :return: Matching postings with title, company, link and an excerpt.
+    """
+    print(f"[TOOL LOG] 'query_job_postings' CALLED for handle '{handle}'")
+    jobs = _load_corpus(handle)
+    if jobs is None:
+        return f"No stored postings for handle '{handle}'. Call scrape_and_extract_skills again."
+    skill_pattern = get_skill_matcher().skill_pattern(skill) if skill else None
+    return query_corpus(jobs, skill_pattern, company, keyword, offset, limit, token_budget)
 
-    # Format the skill summary
-    sorted_skills = sorted(skills.items(), key=lambda item: item[1], reverse=True)
-    
-    # Now, just get the skill names (the keys) from the sorted list
-    skill_names_list = [skill for skill, count in sorted_skills]
-    
-    # Join them into a simple, comma-separated string
-    skill_summary_str = ", ".join(skill_names_list)
 
-    
-    # This is the final string we will return AND cache
-    response_str = f"From {job_count} '{role}' job postings, I extracted the following jobs\n{jobs}"
+def skill_demand_trends(role: str, skill: str = "", days: int = 30) -> str:
+    """
+    Reports how demand for skills in a role is changing over time, from every
+    posting scraped for that role so far (not just the latest scrape).
+
+    :param role: The job title or keyword (e.g., 'data scientist').
+    :param skill: A skill to follow (e.g. 'Kubernetes'). Leave empty for the
+                  top skills of the last `days` days and how each changed.
+    :param days: Length of the period to report on, in days.
+    :return: Top skills with their change vs the previous period, or the
+             weekly share of postings mentioning `skill`.
+    """
+    print(f"[TOOL LOG] 'skill_demand_trends' CALLED for role '{role}', skill '{skill}'")
+    days = max(1, min(int(days), 365))
+    if not skill:
+        return render_top_skills(skill_trends.top_skills(role, k=15, days=days))
+    name = get_skill_matcher().canonical_name(skill) or skill
+    return render_skill_trend(role, name, skill_trends.trend(role, name, days=max(days, 28), bucket_days=7))
 
-    
-    print(f"[TOOL LOG] Returning jobs:\n{response_str}")
-    return response_str
 
-    # except Exception as e:
-    #     print(f"[TOOL ERROR] An exception occurred: {str(e)}")
-    #     traceback.print_exc(file=sys.stdout)
-    #     return f"Error: The tool failed to run. Check logs for details: {str(e)}"
+def _load_corpus(handle):
+    """Postings behind ``handle``, re-scraped if the summary outlived them.
 
-@app.entrypoint
-def invoke(payload, context):
-    global current_session
+    Summaries are shared by every container (DynamoDB by default) while the
+    corpus is local, so a new container can serve a summary whose postings it
+    never had. Asking the model to call scrape_and_extract_skills again would
+    only return the same cached summary, so the scrape is redone here.
+    """
+    jobs = corpus_store.get(handle)
+    if jobs is not None:
+        return jobs
+    entry = result_cache.get_entry(handle)
+    if entry is None or not entry[0]:
+        return None  # unknown handle: a new scrape makes a new one
+    role = entry[0]["role"]
+    print(f"[TOOL LOG] No local postings for handle '{handle}', re-scraping '{role}'")
+    result_cache.refresh(handle, lambda: _scrape_and_summarize(role, handle))
+    jobs = corpus_store.get(handle)
+    if jobs is None:
+        # the refresh was done by another container holding the lease, so
+        # its postings are there, not here
+        _scrape_and_summarize(role, handle)
+        jobs = corpus_store.get(handle)
+    return jobs
 
-    if not MEMORY_ID:
-        return {"error": "Memory not configured"}
 
-    actor_id = context.headers.get('X-Amzn-Bedrock-AgentCore-Runtime-Custom-Actor-Id', 'user') if hasattr(context, 'headers') else 'user'
+def _scrape_and_summarize(role, handle):
+    """Run the real scrape for ``role``; returns None when nothing was found."""
+    print("[TOOL LOG] Scraping and extracting new data...")
+    # skills are counted as postings stream in, not after the whole scrape
+    tally = SkillTally()
+    jobs = []
+    # postings already in the job store are read from there instead of being
+    # fetched again; unseen ones are fetched and appended to it
+    stored_ids = []
+    # every posting is stored, but near-duplicates of one already kept by
+    # this scrape (a repost under a new id, an agency's copy) are neither
+    # counted nor sent to the model
+    dedup = scrape_dedup(role)
+    # the job store is an optimization here: if it can't be read or written
+    # the scrape carries on as if it were empty
+    try:
+        known = job_store.seen_ids(role)
+    except Exception as e:
+        print(f"[STORE ERROR] reading stored '{role}' job_ids failed, fetching every posting: {e}")
+        known = set()
+    with JobStoreSink(role, best_effort=True) as sink:
+        scraped = iter_jobs(role=role, known=known, known_found=stored_ids)
+        for job in tally.tap(dedup.unique(sink.tap(scraped))):
+            jobs.append(job)
+            if streaming():
+                emit_event("progress", stage="jobs", jobs=len(jobs), top_skills=tally.top())
+    try:
+        stored = job_store.get_jobs(role, stored_ids)
+    except Exception as e:
+        print(f"[STORE ERROR] reading {len(stored_ids)} stored '{role}' jobs failed, leaving them out: {e}")
+        stored = []
+    jobs.extend(tally.tap(dedup.unique(stored)))
+    if stored_ids:
+        print(f"[TOOL LOG] {len(stored_ids)} listed postings read from the job store")
+        emit_event("progress", stage="jobs", jobs=len(jobs), top_skills=tally.top(), from_store=len(stored_ids))
+    if dedup.dropped:
+        print(f"[TOOL LOG] Dropped {len(dedup.dropped)} near-duplicate postings")
+    try:
+        skill_trends.sync(force=True)
+    except Exception as e:
+        # trends catch up on the next sync; the summary doesn't depend on them
+        print(f"[TRENDS ERROR] sync after the '{role}' scrape failed: {e}")
 
-    session_id = getattr(context, 'session_id', 'default')
-    current_session = session_id
+    if not jobs:
+        return None
 
-    memory_config = AgentCoreMemoryConfig(
-        memory_id=MEMORY_ID,
-        session_id=session_id,
-        actor_id=actor_id,
-        retrieval_config={
-            f"/users/{actor_id}/facts": RetrievalConfig(top_k=3, relevance_score=0.5),
-            f"/users/{actor_id}/preferences": RetrievalConfig(top_k=3, relevance_score=0.5)
-        }
-    )
+    corpus_store.set(handle, jobs)
+    summary = summarize_jobs(role, jobs, tally.counts, tally.matcher.categories, handle, duplicates=len(dedup.dropped))
+    print(f"[TOOL LOG] Summarized {len(jobs)} jobs, {len(tally.counts)} distinct skills")
+    return summary
+
+# Re-scrapes the most asked-about roles in the background before their
+# summaries expire. Budgeted at a full scrape's worth of requests each: one
+# listing page plus a detail page per card, per page.
+prewarmer = Prewarmer(
+    cache=result_cache,
+    compute=lambda role, key: _scrape_and_summarize(role, key),
+    key_for=lambda role: make_cache_key(role, LOCATION, MAX_PAGES),
+    cost_per_refresh=MAX_PAGES * (1 + PAGE_SIZE),
+)
 
-    system_prompt = """
+SYSTEM_PROMPT = """
     <Instructions>
     You are a specialized Job Market Agent. Your primary function is to use the available tools to find and process job postings.
     1. When a user asks for jobs, your first step is to identify the specific job role or keyword from their request.
-    2. Once you have identified the role, you MUST call the `scrape_job_market` tool.
+    2. Once you have identified the role, you MUST call the `scrape_and_extract_skills` tool.
     3. Pass the identified role as the `role` parameter to the tool.
-    4. After the tool runs, and gets job description, your job is to find the most common skills from the job description extracted by the tool. donot hallucinate that.
-    5. for job description, include list of most useful commonly used skills, it can be technical or soft skils.
+    4. The tool returns the most common skills with how many postings mention them. Base your answer on those counts; donot hallucinate skills that are not in the tool output.
+    5. Include the most useful commonly used skills, both technical and soft skills.
+    6. Only if the user needs details the summary does not have (e.g. what a specific company asks for), call `query_job_postings` with the handle from the summary.
+    7. If the user asks how demand for a role or skill is changing over time, call `skill_demand_trends`.
     Do not answer questions that are not related to finding jobs.
     </Instructions>
     
     <example>
     User: "I want to be a product manager"
-    Agent Action: Calls `scrape_job_market` with the parameter `role='product manager'`
+    Agent Action: Calls `scrape_and_extract_skills` with the parameter `role='product manager'`
     </example>
     """
 
+agents = IdleCache(
+    idle_seconds=AGENT_IDLE_SECONDS,
+    max_entries=AGENT_CACHE_MAX_ENTRIES,
+    on_evict=close_cached_agent,
+).start_reaper()
+
+
+@timed("agent.build")
+def _build_agent(session_id, actor_id):
+    """Agent with AgentCore memory for one (session, actor); built once and reused."""
+    from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig, RetrievalConfig
+    from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
+    from strands import Agent
+
+    memory_config = AgentCoreMemoryConfig(
+        memory_id=MEMORY_ID,
+        session_id=session_id,
+        actor_id=actor_id,
+        retrieval_config={
+            f"/users/{actor_id}/facts": RetrievalConfig(top_k=3, relevance_score=0.5),
+            f"/users/{actor_id}/preferences": RetrievalConfig(top_k=3, relevance_score=0.5)
+        }
+    )
+    session_manager = timed_memory_retrieval(AgentCoreMemorySessionManager(memory_config, REGION))
+
     agent = Agent(
-        model=MODEL_ID,
-        session_manager=AgentCoreMemorySessionManager(memory_config, REGION),
-        system_prompt=system_prompt,
-        tools=[scrape_and_extract_skills]  
+        model=get_bedrock_model(MODEL_ID, REGION),
+        session_manager=session_manager,
+        hooks=[StageTimingHooks()],
+        callback_handler=stream_callback_handler,
+        system_prompt=SYSTEM_PROMPT,
+        tools=strands_tools([scrape_and_extract_skills, query_job_postings, skill_demand_trends])
     )
+    return CachedAgent(agent, session_manager)
+
+
+@app.entrypoint
+def invoke(payload, context):
+    """One agent turn. With ``"stream": true`` in the payload, returns an async
+    generator of events instead: "start", progress and "token" events while
+    the turn runs, then "done" carrying the usual response fields."""
+    if not MEMORY_ID:
+        return {"error": "Memory not configured"}
+
+    session_id, actor_id = request_from_context(context)
+    if payload.get("stream"):
+        return stream_events(lambda: _run_turn(payload, session_id, actor_id))
+    return _run_turn(payload, session_id, actor_id)
+
 
-    result = agent(payload.get("prompt", ""))
-    return {"response": result.message.get('content', [{}])[0].get('text', str(result))}
+def _run_turn(payload, session_id, actor_id):
+    with trace_scope() as trace:
+        cached = agents.get_or_create(
+            (session_id, actor_id), lambda: _build_agent(session_id, actor_id)
+        )
+        with request_scope(session_id, actor_id), cached.lock, span("agent.invoke"):
+            result = cached.agent(payload.get("prompt", ""))
+    response = {"response": result.message.get('content', [{}])[0].get('text', str(result))}
+    if payload.get("trace", TRACE_RESPONSES):
+        response["trace"] = trace.to_dict()
+    return response
 
 
 if __name__ == "__main__":
+    preload_modules(PRELOAD_MODULES)
+    metrics.start_reporter()
+    if PROFILER_ENABLED:
+        profiler.start()
+    if PREWARM_ENABLED:
+        prewarmer.start()
     app.run()
     # role = "Software Developer"
     # result = scrape_and_extract_skills(role)
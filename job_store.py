@@ -0,0 +1,278 @@
+"""
+Append-only Parquet store of scraped job postings.
+
+Layout under JOB_STORE_DIR (hive-partitioned, so readers can prune by role
+and date without opening files):
+
+    role=<role-slug>/fetch_date=<YYYY-MM-DD>/part-<stamp>-<id>.parquet
+    _index/<role-slug>.ids      job_ids already stored for that role
+
+Each run appends only postings whose job_id is not in the role's index, so
+history accumulates instead of being overwritten. Loads are memory-mapped
+and read only the requested columns; trend queries never touch descriptions.
+
+pyarrow is imported on first use, so importing this module (as the agent
+does at startup) stays cheap.
+"""
+from datetime import datetime
+from functools import lru_cache
+import os
+import re
+import tempfile
+import threading
+import uuid
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+# the runtime container's working directory is read-only, so the default is
+# under the temp dir; point JOB_STORE_DIR at a mounted volume to keep history
+JOB_STORE_DIR = os.environ.get("JOB_STORE_DIR", os.path.join(tempfile.gettempdir(), "job_store"))
+# rows buffered by JobStoreSink before a Parquet file is written
+JOB_STORE_FLUSH_ROWS = 500
+
+# every column is a string; fetched_at is "%Y-%m-%d %H:%M:%S" UTC, as the scraper writes it
+JOB_FIELDS = ["job_id", "title", "company", "description", "url", "fetched_at"]
+PARTITION_FIELDS = ["role", "fetch_date"]
+
+
+@lru_cache(maxsize=None)
+def job_schema():
+    import pyarrow as pa
+
+    return pa.schema([(name, pa.string()) for name in JOB_FIELDS])
+
+
+@lru_cache(maxsize=None)
+def partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_FIELDS]), flavor="hive")
+
+
+def _and(condition, term):
+    return term if condition is None else condition & term
+
+
+def role_slug(role):
+    """Partition value for ``role``: "Data  Scientist" -> "data-scientist"."""
+    return re.sub(r"[^a-z0-9]+", "-", str(role).lower()).strip("-")
+
+
+class JobStore:
+    """Parquet job store with a persistent per-role job_id index."""
+
+    def __init__(self, directory=JOB_STORE_DIR):
+        self.directory = directory
+        self._seen = {}  # role slug -> set of job_ids
+        self._lock = threading.Lock()
+
+    def _index_path(self, slug):
+        return os.path.join(self.directory, "_index", f"{slug}.ids")
+
+    def _ids(self, slug):
+        """The live job_id set for ``slug``; the caller holds ``self._lock``."""
+        if slug not in self._seen:
+            self._seen[slug] = self._read_index(slug)
+        return self._seen[slug]
+
+    def seen_ids(self, role):
+        """A copy of the job_ids already stored for ``role``.
+
+        The set is copied under the lock, so ``append`` can't change it
+        while the caller iterates.
+        """
+        with self._lock:
+            return set(self._ids(role_slug(role)))
+
+    def _read_index(self, slug):
+        path = self._index_path(slug)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return {line.strip() for line in f if line.strip()}
+        # no index yet (first run, or it was deleted): rebuild from the data
+        partition = os.path.join(self.directory, f"role={slug}")
+        if not os.path.isdir(partition):
+            return set()
+        import pyarrow.parquet as pq
+
+        ids = set(pq.read_table(partition, columns=["job_id"], partitioning=partitioning())["job_id"].to_pylist())
+        try:
+            self._append_index(slug, ids)
+        except OSError as e:
+            print(f"[STORE ERROR] writing the '{slug}' job_id index failed, rebuilding it next time: {e}")
+        return ids
+
+    def _append_index(self, slug, job_ids):
+        path = self._index_path(slug)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(f"{job_id}\n" for job_id in job_ids)
+
+    def append(self, role, jobs):
+        """Store the postings in ``jobs`` not yet stored for ``role``; returns how many."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        slug = role_slug(role)
+        by_date = {}
+        with self._lock:
+            seen = self._ids(slug)
+            pending = set()
+            for job in jobs:
+                job_id = str(job["job_id"])
+                if job_id in seen or job_id in pending:
+                    continue
+                pending.add(job_id)
+                fetched_at = job.get("fetched_at") or datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+                by_date.setdefault(fetched_at[:10], []).append({**job, "job_id": job_id, "fetched_at": fetched_at})
+
+            # ids become seen only once their part is on disk: if a write
+            # fails, the postings it held are stored by a later append
+            added = []
+            try:
+                for fetch_date, rows in by_date.items():
+                    partition = os.path.join(self.directory, f"role={slug}", f"fetch_date={fetch_date}")
+                    os.makedirs(partition, exist_ok=True)
+                    table = pa.Table.from_pylist(rows, schema=job_schema())
+                    name = f"part-{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+                    # write then rename so readers never see half a file
+                    tmp_path = os.path.join(partition, f".{name}.tmp")
+                    pq.write_table(table, tmp_path, compression="zstd")
+                    os.replace(tmp_path, os.path.join(partition, name))
+                    added += [row["job_id"] for row in rows]
+                    seen.update(row["job_id"] for row in rows)
+            finally:
+                if added:
+                    self._append_index(slug, added)
+        return len(added)
+
+    def parts(self, role=None):
+        """``(role_slug, fetch_date, path)`` for every stored Parquet file.
+
+        Files are immutable once written, so a path identifies a fixed set of
+        postings; consumers can track which parts they have already seen.
+        """
+        found = []
+        roles = [f"role={role_slug(role)}"] if role is not None else (
+            sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []
+        )
+        for role_dir in roles:
+            role_path = os.path.join(self.directory, role_dir)
+            if not role_dir.startswith("role=") or not os.path.isdir(role_path):
+                continue
+            for date_dir in sorted(os.listdir(role_path)):
+                date_path = os.path.join(role_path, date_dir)
+                if not date_dir.startswith("fetch_date=") or not os.path.isdir(date_path):
+                    continue
+                for name in sorted(os.listdir(date_path)):
+                    if name.endswith(".parquet") and not name.startswith("."):
+                        found.append((role_dir[len("role="):], date_dir[len("fetch_date="):], os.path.join(date_path, name)))
+        return found
+
+    def load(self, roles=None, columns=None, since=None, until=None, job_ids=None):
+        """Read stored postings as an Arrow table.
+
+        ``roles`` limits the role partitions read; ``since``/``until`` are
+        inclusive "YYYY-MM-DD" bounds on the fetch date and ``job_ids``
+        keeps only those postings. Only ``columns`` are
+        read (``role`` and ``fetch_date`` are available as columns too), and
+        files are memory-mapped rather than copied into memory.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.fs as fs
+
+        names = columns or JOB_FIELDS + PARTITION_FIELDS
+        if not os.path.isdir(self.directory):
+            return pa.table({name: pa.array([], pa.string()) for name in names})
+        dataset = ds.dataset(
+            self.directory,
+            format="parquet",
+            partitioning=partitioning(),
+            filesystem=fs.LocalFileSystem(use_mmap=True),
+            ignore_prefixes=[".", "_"],
+        )
+        condition = None
+        if roles is not None:
+            condition = _and(condition, ds.field("role").isin([role_slug(role) for role in roles]))
+        if since:
+            condition = _and(condition, ds.field("fetch_date") >= since)
+        if until:
+            condition = _and(condition, ds.field("fetch_date") <= until)
+        if job_ids is not None:
+            condition = _and(condition, ds.field("job_id").isin([str(job_id) for job_id in job_ids]))
+        return dataset.to_table(columns=names, filter=condition)
+
+    def load_frame(self, roles=None, columns=None, since=None, until=None):
+        """``load`` as a pandas DataFrame."""
+        return self.load(roles, columns, since, until).to_pandas()
+
+    def get_jobs(self, role, job_ids):
+        """Stored job dicts for ``job_ids`` of ``role``, in the order given."""
+        if not job_ids:
+            return []
+        rows = self.load([role], JOB_FIELDS, job_ids=job_ids).to_pylist()
+        by_id = {row["job_id"]: row for row in rows}
+        return [by_id[str(job_id)] for job_id in job_ids if str(job_id) in by_id]
+
+
+class JobStoreSink:
+    """Streaming writer into a JobStore, buffered into Parquet-sized batches.
+
+    ``tap`` stores the postings of a streaming scrape as they pass. With
+    ``best_effort``, write errors are logged and the batch dropped instead
+    of raised, so a broken store never breaks the scrape that feeds it.
+    """
+
+    def __init__(self, role, store=None, flush_rows=JOB_STORE_FLUSH_ROWS, best_effort=False):
+        self.role = role
+        self.store = store or job_store
+        self.flush_rows = flush_rows
+        self.best_effort = best_effort
+        self._buffer = []
+        self.count = 0
+
+    def write(self, job):
+        self._buffer.append(job)
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def tap(self, jobs):
+        """Write each job in ``jobs`` while passing it through."""
+        for job in jobs:
+            self.write(job)
+            yield job
+
+    def flush(self):
+        if not self._buffer:
+            return
+        buffer, self._buffer = self._buffer, []
+        try:
+            self.count += self.store.append(self.role, buffer)
+        except Exception as e:
+            if not self.best_effort:
+                raise
+            print(f"[STORE ERROR] storing {len(buffer)} '{self.role}' jobs failed: {e}")
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_to_store(jobs, role, store=None):
+    """Append the unseen postings in ``jobs`` (any iterable) to the job store."""
+    with JobStoreSink(role, store) as sink:
+        for job in jobs:
+            sink.write(job)
+    print(f"✅ Stored {sink.count} new '{role}' jobs in {sink.store.directory}")
+    return sink.count
+
+
+job_store = JobStore()
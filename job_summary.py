@@ -0,0 +1,173 @@
+import re
+from collections import Counter
+
+# Rough token estimate for Nova / Claude style tokenizers; good enough to
+# keep tool output inside a budget without pulling in a tokenizer.
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 800
+TOP_SKILLS = 25
+TOP_TITLES = 8
+TOP_COMPANIES = 8
+SNIPPET_CHARS = 240
+SNIPPET_COUNT = 3
+QUERY_MAX_LIMIT = 20  # postings per query_corpus page
+
+# Where in a posting the skill requirements usually start
+_REQUIREMENTS_CUE = re.compile(
+    r"(qualifications|requirements|what you('|’)ll need|what you bring|you have|experience with)",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _snippet(description, around=None, size=SNIPPET_CHARS):
+    """``size`` characters of ``description`` starting near ``around``."""
+    if not description:
+        return ""
+    start = 0
+    match = around.search(description) if around is not None else None
+    if match:
+        start = max(0, match.start() - 40)
+    text = description[start:start + size].strip()
+    prefix = "…" if start else ""
+    suffix = "…" if start + size < len(description) else ""
+    return f"{prefix}{text}{suffix}"
+
+
+def summarize_jobs(role, jobs, skill_counts, categories=None, handle=None, duplicates=0):
+    """Reduce a scrape to a small, JSON-serializable summary.
+
+    The summary is what gets cached and rendered for the agent; the full
+    postings stay server-side under ``handle``. ``duplicates`` is how many
+    near-duplicate postings were left out of ``jobs``.
+    """
+    categories = categories or {}
+    job_count = len(jobs)
+    ranked = sorted(skill_counts.items(), key=lambda item: (-item[1], item[0]))[:TOP_SKILLS]
+
+    snippets, companies_seen = [], set()
+    for job in jobs:
+        if len(snippets) >= SNIPPET_COUNT:
+            break
+        if job.get("company") in companies_seen:
+            continue
+        companies_seen.add(job.get("company"))
+        snippets.append({
+            "title": job.get("title"),
+            "company": job.get("company"),
+            "text": _snippet(job.get("description"), _REQUIREMENTS_CUE),
+        })
+
+    return {
+        "role": role,
+        "job_count": job_count,
+        "skills": [
+            [name, count, round(100 * count / job_count), categories.get(name, "technical")]
+            for name, count in ranked
+        ],
+        "titles": Counter(job.get("title") for job in jobs if job.get("title")).most_common(TOP_TITLES),
+        "companies": Counter(job.get("company") for job in jobs if job.get("company")).most_common(TOP_COMPANIES),
+        "snippets": snippets,
+        "handle": handle,
+        "duplicates": duplicates,
+    }
+
+
+def _fit(lines, budget):
+    """Keep whole lines from the front of ``lines`` until ``budget`` is spent."""
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return kept, used
+
+
+def render_summary(summary, token_budget=DEFAULT_TOKEN_BUDGET):
+    """Render a summary as plain text that fits in ``token_budget`` tokens.
+
+    Sections are filled in priority order (skills, then titles, companies
+    and snippets), each truncated to what the remaining budget allows.
+    """
+    role, job_count = summary["role"], summary["job_count"]
+    header = f"From {job_count} '{role}' job postings:"
+    if summary.get("duplicates"):
+        header = f"From {job_count} '{role}' job postings ({summary['duplicates']} near-duplicate reposts left out):"
+    footer = (
+        f"Full postings are stored under handle '{summary['handle']}'; call "
+        f"query_job_postings with it to read matching postings."
+        if summary.get("handle") else ""
+    )
+    budget = max(0, token_budget - estimate_tokens(header) - estimate_tokens(footer))
+    out = [header]
+
+    sections = []
+    for category, title in (("technical", "Technical skills"), ("soft", "Soft skills")):
+        rows = [f"- {name}: {count} jobs ({pct}%)" for name, count, pct, cat in summary["skills"] if cat == category]
+        if rows:
+            sections.append((f"{title} (jobs mentioning, % of {job_count}):", rows))
+    sections.append(("Top titles:", [f"- {title} ({count})" for title, count in summary["titles"]]))
+    sections.append(("Top companies:", [f"- {company} ({count})" for company, count in summary["companies"]]))
+    sections.append((
+        "Representative excerpts:",
+        [f"- {s['title']} @ {s['company']}: {s['text']}" for s in summary["snippets"]],
+    ))
+
+    for heading, rows in sections:
+        if not rows:
+            continue
+        kept, used = _fit([heading] + rows, budget)
+        if len(kept) < 2:
+            break  # not even one row fits; later sections are lower priority
+        out += kept
+        budget -= used
+
+    if footer:
+        out.append(footer)
+    return "\n".join(out)
+
+
+def query_corpus(jobs, skill_pattern=None, company="", keyword="", offset=0, limit=5,
+                 token_budget=DEFAULT_TOKEN_BUDGET):
+    """Render postings from a stored corpus that match all given filters.
+
+    ``skill_pattern`` is a compiled regex (e.g. from the skill matcher) or
+    None; ``company`` and ``keyword`` are case-insensitive substrings.
+    ``offset`` is clamped at 0 and ``limit`` to 1..QUERY_MAX_LIMIT.
+    """
+    # offset and limit come from the model; keep them in range
+    offset = max(0, int(offset))
+    limit = max(1, min(int(limit), QUERY_MAX_LIMIT))
+    keyword_re = re.compile(re.escape(keyword), re.IGNORECASE) if keyword else None
+    matches = []
+    for job in jobs:
+        description = job.get("description") or ""
+        if company and company.lower() not in (job.get("company") or "").lower():
+            continue
+        if skill_pattern is not None and not skill_pattern.search(description):
+            continue
+        if keyword_re is not None and not keyword_re.search(description):
+            continue
+        matches.append(job)
+
+    page = matches[offset:offset + limit]
+    if not page:
+        return f"{len(matches)} matching postings; nothing at offset {offset}."
+    rows = [
+        f"- {job.get('title')} @ {job.get('company')} ({job.get('url')}): "
+        f"{_snippet(job.get('description'), keyword_re or skill_pattern or _REQUIREMENTS_CUE)}"
+        for job in page
+    ]
+    # the header can only get shorter once rows are dropped, so reserve room
+    # for the full page's and write it from the rows that fit
+    full_header = f"{len(matches)} matching postings; showing {offset + 1}-{offset + len(page)}."
+    kept, _ = _fit(rows, max(0, token_budget - estimate_tokens(full_header)))
+    if not kept:
+        return f"{len(matches)} matching postings; posting {offset + 1} does not fit the token budget."
+    header = f"{len(matches)} matching postings; showing {offset + 1}-{offset + len(kept)}."
+    return "\n".join([header] + kept)
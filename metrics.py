@@ -0,0 +1,375 @@
+"""
+Stage timings, counters and an opt-in sampling profiler.
+
+``span("stage")`` times a block of code. Every span feeds a per-stage latency
+histogram; inside ``trace_scope()`` it is also recorded in that request's
+trace, which the entrypoints can return with the response. Counters track
+cache hits/misses, HTTP status codes and the like.
+
+Metrics are printed as a ``[METRICS LOG]`` summary every
+METRICS_REPORT_SECONDS and, with METRICS_EMF=1, as CloudWatch Embedded
+Metric Format lines, which the AgentCore runtime's log group turns into
+CloudWatch metrics without any extra agent.
+
+Spans only cost two clock reads and a dict update, so the scraper and skill
+matcher stay instrumented in production.
+"""
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+METRICS_REPORT_SECONDS = int(os.environ.get("METRICS_REPORT_SECONDS", "60"))
+METRICS_EMF = os.environ.get("METRICS_EMF", "0") == "1"
+METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "JobMarketAgent")
+# upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+# spans kept per request trace; later ones still count towards the stage totals
+TRACE_MAX_SPANS = 200
+# return every request's trace with its response, not only when the payload asks
+TRACE_RESPONSES = os.environ.get("TRACE_RESPONSES", "0") == "1"
+
+PROFILER_ENABLED = os.environ.get("PROFILER_ENABLED", "0") == "1"
+PROFILER_INTERVAL_SECONDS = float(os.environ.get("PROFILER_INTERVAL_SECONDS", "0.01"))
+# the runtime container's working directory is read-only
+PROFILER_OUTPUT = os.environ.get("PROFILER_OUTPUT", os.path.join(tempfile.gettempdir(), "profile.folded"))
+PROFILER_DUMP_SECONDS = 60
+
+
+class Histogram:
+    """Bucketed latency distribution with count, sum and max."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last bucket: above the largest bound
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile (max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum, 3),
+            "max_ms": round(self.max, 3),
+            "p50_ms": round(self.quantile(0.5), 3),
+            "p95_ms": round(self.quantile(0.95), 3),
+            "p99_ms": round(self.quantile(0.99), 3),
+        }
+
+
+def _metric_key(name, labels):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in sorted(labels.items())) + "}"
+
+
+class MetricsRegistry:
+    """Process-wide counters and latency histograms."""
+
+    def __init__(self):
+        self._counters = Counter()
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._reporter = None
+
+    def incr(self, name, value=1, **labels):
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name, value_ms):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(value_ms)
+
+    def snapshot(self):
+        """``{"counters": {...}, "latency": {stage: histogram summary}}``."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "latency": {name: h.snapshot() for name, h in self._histograms.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def report(self, reset=True):
+        """Print the metrics gathered since the last report (and EMF lines if enabled)."""
+        with self._lock:
+            counters, self._counters = self._counters, Counter() if reset else self._counters.copy()
+            histograms = self._histograms
+            if reset:
+                self._histograms = {}
+        for name, histogram in sorted(histograms.items()):
+            s = histogram.snapshot()
+            print(f"[METRICS LOG] {name}: n={s['count']} p50={s['p50_ms']}ms "
+                  f"p95={s['p95_ms']}ms max={s['max_ms']}ms")
+        if counters:
+            print("[METRICS LOG] " + " ".join(f"{k}={v}" for k, v in sorted(counters.items())))
+        if METRICS_EMF:
+            for line in _emf_lines(counters, histograms):
+                print(line)
+
+    def start_reporter(self, interval=METRICS_REPORT_SECONDS):
+        """Call ``report`` every ``interval`` seconds on a daemon thread."""
+        if self._reporter is not None:
+            return self
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.report()
+
+        self._reporter = threading.Thread(target=loop, name="metrics-reporter", daemon=True)
+        self._reporter.start()
+        return self
+
+
+def _emf_lines(counters, histograms):
+    """CloudWatch Embedded Metric Format documents, one per metric."""
+    timestamp = int(time.time() * 1000)
+    for key, value in counters.items():
+        name, _, labels = key.partition("{")
+        dimensions = dict(item.split("=", 1) for item in labels.rstrip("}").split(",")) if labels else {}
+        yield json.dumps({
+            "_aws": {"Timestamp": timestamp, "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [sorted(dimensions)],
+                "Metrics": [{"Name": name, "Unit": "Count"}],
+            }]},
+            name: value,
+            **dimensions,
+        })
+    for name, histogram in histograms.items():
+        # EMF takes value/count pairs: one value per non-empty bucket
+        values, counts = [], []
+        for bound, count in zip(histogram.buckets + (histogram.max,), histogram.counts):
+            if count:
+                values.append(min(float(bound), histogram.max))
+                counts.append(count)
+        yield json.dumps({
+            "_aws": {"Timestamp": timestamp, "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["stage"]],
+                "Metrics": [{"Name": "latency", "Unit": "Milliseconds"}],
+            }]},
+            "latency": {"Values": values, "Counts": counts},
+            "stage": name,
+        })
+
+
+metrics = MetricsRegistry()
+incr = metrics.incr
+
+
+# --------------------------------
+# Request traces
+# --------------------------------
+class Trace:
+    """Spans recorded during one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self.stages = {}  # stage -> [count, total_ms]
+        self._lock = threading.Lock()
+
+    def add(self, name, started, duration_ms, attrs):
+        with self._lock:
+            totals = self.stages.setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += duration_ms
+            if len(self.spans) < TRACE_MAX_SPANS:
+                self.spans.append({
+                    "stage": name,
+                    "start_ms": round((started - self.started) * 1000, 3),
+                    "duration_ms": round(duration_ms, 3),
+                    **attrs,
+                })
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+                "stages": {
+                    name: {"count": count, "total_ms": round(total, 3)}
+                    for name, (count, total) in sorted(self.stages.items(), key=lambda item: -item[1][1])
+                },
+                "spans": list(self.spans),
+                "dropped_spans": sum(count for count, _ in self.stages.values()) - len(self.spans),
+            }
+
+
+_trace = ContextVar("trace", default=None)
+
+
+@contextmanager
+def trace_scope():
+    """Record the spans of the enclosed code (and the threads it hands work to) in a Trace."""
+    trace = Trace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+def current_trace():
+    return _trace.get()
+
+
+def record_span(name, started, **attrs):
+    """Close a span that began at ``time.perf_counter() == started``."""
+    duration_ms = (time.perf_counter() - started) * 1000
+    metrics.observe(name, duration_ms)
+    trace = _trace.get()
+    if trace is not None:
+        trace.add(name, started, duration_ms, attrs)
+    return duration_ms
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time the enclosed block as stage ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        record_span(name, started, error=type(e).__name__, **attrs)
+        raise
+    record_span(name, started, **attrs)
+
+
+def timed(name):
+    """Decorator form of ``span``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --------------------------------
+# Sampling profiler
+# --------------------------------
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Samples every thread's stack every ``interval`` seconds.
+
+    Stacks are aggregated in "folded" form (``a;b;c count`` per line), which
+    flamegraph.pl and speedscope read directly. Sampling costs one walk over
+    the thread stacks per tick, so it is opt-in (PROFILER_ENABLED=1).
+    """
+
+    def __init__(self, interval=PROFILER_INTERVAL_SECONDS, output=PROFILER_OUTPUT):
+        self.interval = interval
+        self.output = output
+        self.stacks = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        taken = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            taken.append(";".join(reversed(stack)))
+        with self._lock:
+            self.stacks.update(taken)
+            self.samples += 1
+
+    def top(self, n=20):
+        """The ``n`` functions most often on top of a stack, as ``(label, samples)``."""
+        leaves = Counter()
+        with self._lock:
+            for stack, count in self.stacks.items():
+                leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+    def write(self, path=None):
+        path = path or self.output
+        with self._lock:
+            lines = [f"{stack} {count}\n" for stack, count in self.stacks.most_common()]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, path)
+        print(f"[PROFILER LOG] {self.samples} samples written to {path}")
+
+    def start(self, dump_every=PROFILER_DUMP_SECONDS):
+        """Sample on a daemon thread, rewriting ``output`` every ``dump_every`` seconds."""
+        if self._thread is not None:
+            return self
+
+        def loop():
+            next_dump = time.monotonic() + dump_every
+            while not self._stop.wait(self.interval):
+                self.sample()
+                if time.monotonic() >= next_dump:
+                    try:
+                        self.write()
+                    except OSError as e:
+                        # keep sampling; the next dump tries again
+                        print(f"[PROFILER ERROR] writing {self.output} failed: {e}")
+                    next_dump = time.monotonic() + dump_every
+
+        self._thread = threading.Thread(target=loop, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.write()
+
+
+profiler = SamplingProfiler()
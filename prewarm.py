@@ -0,0 +1,187 @@
+"""
+Background pre-warming of popular role queries.
+
+The agent process records every role it is asked about. A daemon thread
+periodically re-runs the scrape for the top N roles whose cached summaries
+are missing or about to expire, so interactive calls are served warm. Total
+outbound traffic from pre-warming is capped by a rolling request budget.
+
+The budget and query counts live in the process. Without the DynamoDB lease
+(CACHE_LEASE_ENABLED) every container would spend its own budget re-scraping
+the same roles, so pre-warming is off by default unless the lease is on.
+"""
+from collections import deque
+import math
+import os
+import threading
+import time
+
+from cache import CACHE_LEASE_ENABLED
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+PREWARM_ENABLED = os.environ.get("PREWARM_ENABLED", "1" if CACHE_LEASE_ENABLED else "0") == "1"
+PREWARM_TOP_N = int(os.environ.get("PREWARM_TOP_N", "5"))
+PREWARM_INTERVAL_SECONDS = int(os.environ.get("PREWARM_INTERVAL_SECONDS", str(10 * 60)))
+# let the container finish starting up before the first round
+PREWARM_START_DELAY_SECONDS = int(os.environ.get("PREWARM_START_DELAY_SECONDS", "60"))
+# refresh an entry once it is this close to its TTL
+PREWARM_REFRESH_AHEAD_SECONDS = 24 * 60 * 60  # 1 day
+# outbound LinkedIn requests pre-warming may spend per rolling window
+PREWARM_REQUEST_BUDGET = int(os.environ.get("PREWARM_REQUEST_BUDGET", "1500"))
+PREWARM_BUDGET_WINDOW_SECONDS = 24 * 60 * 60
+# a role whose refresh found nothing (or failed) is not retried for this long
+PREWARM_EMPTY_BACKOFF_SECONDS = 24 * 60 * 60
+# a query's weight halves every 3 days, so popularity follows recent demand
+PREWARM_HALF_LIFE_SECONDS = 3 * 24 * 60 * 60
+# roles we ship CSVs for; warm from the start, then decay like any other query
+PREWARM_SEED_ROLES = ["Software Developer", "Data Scientist"]
+
+
+class QueryStats:
+    """Exponentially decayed query counts per cache key."""
+
+    def __init__(self, half_life=PREWARM_HALF_LIFE_SECONDS):
+        self.decay = math.log(2) / half_life
+        self._scores = {}  # key -> [score, updated_at, role]
+        self._lock = threading.Lock()
+
+    def record(self, key, role, weight=1.0, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            score, updated_at, _ = self._scores.get(key, (0.0, now, role))
+            self._scores[key] = [score * math.exp(-self.decay * (now - updated_at)) + weight, now, role]
+
+    def top(self, n, now=None):
+        """The ``n`` most queried ``(key, role, score)``, highest score first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            ranked = [
+                (key, role, score * math.exp(-self.decay * (now - updated_at)))
+                for key, (score, updated_at, role) in self._scores.items()
+            ]
+        ranked.sort(key=lambda item: -item[2])
+        return ranked[:n]
+
+
+class RequestBudget:
+    """At most ``limit`` outbound requests per rolling ``window`` seconds."""
+
+    def __init__(self, limit=PREWARM_REQUEST_BUDGET, window=PREWARM_BUDGET_WINDOW_SECONDS):
+        self.limit = limit
+        self.window = window
+        self._spent = deque()  # (time, cost)
+        self._lock = threading.Lock()
+
+    def remaining(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            while self._spent and self._spent[0][0] <= now - self.window:
+                self._spent.popleft()
+            return self.limit - sum(cost for _, cost in self._spent)
+
+    def try_spend(self, cost, now=None):
+        """Reserve ``cost`` requests if the budget allows it."""
+        now = time.time() if now is None else now
+        if self.remaining(now) < cost:
+            return False
+        with self._lock:
+            self._spent.append((now, cost))
+        return True
+
+
+class Prewarmer:
+    """Keeps the summaries of the most queried roles fresh in ``cache``.
+
+    ``key_for(role)`` maps a role to its cache key and ``compute(role, key)``
+    produces the value to cache (None means nothing found). Each refresh is
+    charged ``cost_per_refresh`` requests, the scrape's worst case, against
+    ``budget`` before it starts. A role whose refresh finds nothing or fails
+    is skipped for ``empty_backoff`` seconds, so it doesn't spend the budget
+    every round.
+    """
+
+    def __init__(
+        self,
+        cache,
+        compute,
+        key_for,
+        cost_per_refresh,
+        top_n=PREWARM_TOP_N,
+        interval=PREWARM_INTERVAL_SECONDS,
+        refresh_ahead=PREWARM_REFRESH_AHEAD_SECONDS,
+        budget=None,
+        stats=None,
+        seed_roles=PREWARM_SEED_ROLES,
+        empty_backoff=PREWARM_EMPTY_BACKOFF_SECONDS,
+    ):
+        self.cache = cache
+        self.compute = compute
+        self.key_for = key_for
+        self.cost_per_refresh = cost_per_refresh
+        self.top_n = top_n
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.budget = budget or RequestBudget()
+        self.stats = stats or QueryStats()
+        self.empty_backoff = empty_backoff
+        self._retry_at = {}  # key -> time before which it is not refreshed again
+        self._thread = None
+        for role in seed_roles:
+            self.record(role)
+
+    def record(self, role):
+        """Count one query for ``role``."""
+        role = " ".join(role.split())
+        self.stats.record(self.key_for(role), role)
+
+    def due(self, now=None):
+        """Top roles whose cached entry is missing or within ``refresh_ahead`` of its TTL."""
+        now = time.time() if now is None else now
+        due = []
+        for key, role, _ in self.stats.top(self.top_n, now):
+            if now < self._retry_at.get(key, 0):
+                continue
+            entry = self.cache.get_entry(key)
+            if entry is None or now - entry[1] >= self.cache.ttl - self.refresh_ahead:
+                due.append((key, role))
+        return due
+
+    def run_once(self, now=None):
+        """Refresh every due role the budget allows; returns how many were refreshed."""
+        now = time.time() if now is None else now
+        refreshed = 0
+        for key, role in self.due(now):
+            if not self.budget.try_spend(self.cost_per_refresh, now):
+                print(f"[PREWARM LOG] Request budget spent ({self.budget.remaining(now)} left); "
+                      f"skipping '{role}' until the next round")
+                break
+            print(f"[PREWARM LOG] Refreshing '{key}' ahead of expiry")
+            try:
+                value = self.cache.refresh(key, lambda: self.compute(role, key))
+            except Exception as e:
+                print(f"[PREWARM ERROR] Refreshing '{key}' failed: {e}")
+                value = None
+            if value is None:
+                print(f"[PREWARM LOG] Nothing cached for '{key}'; retrying it in {self.empty_backoff}s")
+                self._retry_at[key] = now + self.empty_backoff
+                continue
+            self._retry_at.pop(key, None)
+            refreshed += 1
+        return refreshed
+
+    def start(self, delay=PREWARM_START_DELAY_SECONDS):
+        """Run ``run_once`` every ``interval`` seconds on a daemon thread."""
+        if self._thread is not None:
+            return self
+
+        def loop():
+            time.sleep(delay)
+            while True:
+                self.run_once()
+                time.sleep(self.interval)
+
+        self._thread = threading.Thread(target=loop, name="prewarm", daemon=True)
+        self._thread.start()
+        return self
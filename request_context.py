@@ -0,0 +1,118 @@
+"""
+Request-scoped context for the AgentCore entrypoints.
+
+``invoke`` binds the caller's session and actor for the duration of a
+request; tools read them back with ``current_request()``. This is a
+ContextVar rather than a module global, so concurrent invocations on one
+container never see each other's session. Strands runs a synchronous
+``agent(prompt)`` in a copy of the caller's context and calls sync tools via
+``asyncio.to_thread``, so the binding reaches every ``@tool`` function.
+
+Streaming invocations bind an event sink the same way: tools and the
+scraper report progress with ``emit_event``, the agent's callback handler
+forwards model tokens, and ``stream_events`` turns them into the async
+generator the AgentCore app streams back as server-sent events.
+"""
+import asyncio
+from collections import namedtuple
+from contextlib import contextmanager
+import contextvars
+import threading
+
+RequestContext = namedtuple("RequestContext", ["session_id", "actor_id"])
+
+ACTOR_ID_HEADER = "X-Amzn-Bedrock-AgentCore-Runtime-Custom-Actor-Id"
+
+DEFAULT_REQUEST = RequestContext(session_id="default", actor_id="user")
+
+_current_request = contextvars.ContextVar("current_request", default=DEFAULT_REQUEST)
+
+
+def current_request():
+    """The RequestContext of the invocation running in this context."""
+    return _current_request.get()
+
+
+@contextmanager
+def request_scope(session_id, actor_id):
+    """Bind ``session_id`` and ``actor_id`` for the code inside the ``with``."""
+    token = _current_request.set(RequestContext(session_id, actor_id))
+    try:
+        yield _current_request.get()
+    finally:
+        _current_request.reset(token)
+
+
+def request_from_context(context):
+    """Session and actor ids from an AgentCore ``RequestContext``.
+
+    The SDK exposes headers as ``request_headers``; header names are matched
+    case-insensitively since proxies may lowercase them.
+    """
+    headers = getattr(context, "request_headers", None) or getattr(context, "headers", None) or {}
+    actor_id = next(
+        (value for name, value in headers.items() if name.lower() == ACTOR_ID_HEADER.lower() and value),
+        DEFAULT_REQUEST.actor_id,
+    )
+    session_id = getattr(context, "session_id", None) or DEFAULT_REQUEST.session_id
+    return RequestContext(session_id, actor_id)
+
+
+_event_sink = contextvars.ContextVar("event_sink", default=None)
+
+
+def emit_event(event, **fields):
+    """Send ``{"event": event, **fields}`` to the streaming caller, if there is one."""
+    sink = _event_sink.get()
+    if sink is not None:
+        sink({"event": event, **fields})
+
+
+def streaming():
+    """True inside ``stream_events``; lets callers skip building events nobody reads."""
+    return _event_sink.get() is not None
+
+
+def stream_callback_handler(**kwargs):
+    """Strands ``callback_handler`` that streams model text as "token" events."""
+    if "data" in kwargs:
+        emit_event("token", data=kwargs["data"])
+
+
+def stream_events(run):
+    """Run ``run()`` on a worker thread; an async generator of the events it emits.
+
+    Starts with a "start" event, so the caller gets its first byte at once,
+    and ends with ``{"event": "done", **run()}`` or an "error" event. ``run``
+    executes in a copy of the caller's context, taken now rather than when
+    the generator is first iterated. If the client goes away it still runs
+    to completion, so the agent turn is not cut off halfway through.
+    """
+    return _stream_events(run, contextvars.copy_context())
+
+
+async def _stream_events(run, context):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    done = object()
+
+    def push(event):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        except RuntimeError:
+            pass  # the server's loop has shut down; nobody is listening
+
+    def worker():
+        token = _event_sink.set(push)
+        try:
+            push({"event": "done", **run()})
+        except Exception as e:
+            push({"event": "error", "error": str(e), "error_type": type(e).__name__})
+        finally:
+            _event_sink.reset(token)
+            push(done)
+
+    yield {"event": "start"}
+    threading.Thread(target=context.run, args=(worker,), name="stream-turn", daemon=True).start()
+    while (event := await queue.get()) is not done:
+        yield event
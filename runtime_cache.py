@@ -0,0 +1,274 @@
+"""
+Per-process object reuse for the AgentCore entrypoints.
+
+Agents and memory session managers are cached per (session, actor) and
+evicted after sitting idle; so are code-interpreter sessions, which are
+stopped on eviction. boto3 clients are shared by the whole process.
+Agents built here report model calls, tool calls and memory retrieval as
+metrics stages (see metrics.py).
+
+Nothing heavy is imported at module level: strands, boto3 and the AgentCore
+SDK modules load on first use, or in the background via ``preload_modules``
+once the server is up, so they stay off the container's cold-start path.
+"""
+import importlib
+import threading
+import time
+
+from metrics import record_span, span
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+AGENT_IDLE_SECONDS = 15 * 60  # evict a session's agent after 15 idle minutes
+AGENT_CACHE_MAX_ENTRIES = 256
+# Stop a code-interpreter session well before its 30 minute server-side timeout
+CODE_INTERPRETER_IDLE_SECONDS = 10 * 60
+CODE_INTERPRETER_MAX_SESSIONS = 32
+CODE_INTERPRETER_SESSION_TIMEOUT_SECONDS = 1800
+
+
+class IdleCache:
+    """Thread-safe keyed cache that drops entries unused for ``idle_seconds``.
+
+    When ``max_entries`` is exceeded the least recently used entry goes first.
+    ``on_evict(key, value)`` runs outside the lock for every dropped entry,
+    e.g. to close a session manager or stop a code-interpreter session.
+    """
+
+    def __init__(self, idle_seconds, max_entries=None, on_evict=None):
+        self.idle_seconds = idle_seconds
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries = {}  # key -> [value, last_used]
+        self._lock = threading.Lock()
+        self._creating = {}  # key -> Lock, so one factory call runs per key
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry[1] = time.monotonic()
+            return entry[0]
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for ``key``, building it with ``factory()``."""
+        self.evict_idle()
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            creating = self._creating.setdefault(key, threading.Lock())
+        with creating:
+            value = self.get(key)  # another thread may have just built it
+            if value is None:
+                value = factory()
+                self._put(key, value)
+        with self._lock:
+            self._creating.pop(key, None)
+        return value
+
+    def _put(self, key, value):
+        evicted = []
+        with self._lock:
+            self._entries[key] = [value, time.monotonic()]
+            while self.max_entries and len(self._entries) > self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                evicted.append((oldest, self._entries.pop(oldest)[0]))
+        self._notify(evicted)
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._notify([(key, entry[0])])
+
+    def evict_idle(self):
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            stale = [key for key, (_, last_used) in self._entries.items() if last_used < cutoff]
+            evicted = [(key, self._entries.pop(key)[0]) for key in stale]
+        self._notify(evicted)
+
+    def start_reaper(self, interval=60):
+        """Run ``evict_idle`` every ``interval`` seconds on a daemon thread.
+
+        Without it, entries are only evicted when the cache is next used, so
+        an idle container would hold its last sessions open indefinitely.
+        """
+        def reap():
+            while True:
+                time.sleep(interval)
+                self.evict_idle()
+
+        threading.Thread(target=reap, name="idle-cache-reaper", daemon=True).start()
+        return self
+
+    def _notify(self, evicted):
+        if not self.on_evict:
+            return
+        for key, value in evicted:
+            try:
+                self.on_evict(key, value)
+            except Exception as e:
+                print(f"[CACHE ERROR] evicting '{key}' failed: {e}")
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(service, region_name=None):
+    """Process-wide boto3 client for ``service``; boto3 clients are thread-safe."""
+    key = (service, region_name)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                import boto3
+
+                client = _clients[key] = boto3.client(service, region_name=region_name)
+    return client
+
+
+_models = {}
+
+
+def get_bedrock_model(model_id, region_name=None):
+    """Process-wide Strands BedrockModel, so agents share one bedrock-runtime client."""
+    key = (model_id, region_name)
+    model = _models.get(key)
+    if model is None:
+        with _clients_lock:
+            model = _models.get(key)
+            if model is None:
+                from strands.models.bedrock import BedrockModel
+
+                model = _models[key] = BedrockModel(model_id=model_id, region_name=region_name)
+    return model
+
+
+_tools = {}
+
+
+def strands_tools(functions):
+    """Strands tools for plain tool functions, built once per process.
+
+    The entrypoints define their tools as plain functions and wrap them here
+    instead of with ``@tool`` at import time, so importing them does not
+    load strands.
+    """
+    key = tuple(functions)
+    tools = _tools.get(key)
+    if tools is None:
+        with _clients_lock:
+            tools = _tools.get(key)
+            if tools is None:
+                from strands import tool
+
+                tools = _tools[key] = [tool(function) for function in functions]
+    return tools
+
+
+def preload_modules(names):
+    """Import ``names`` on a daemon thread, so the first request doesn't pay for them."""
+    def preload():
+        started = time.perf_counter()
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"[STARTUP ERROR] preloading {name} failed: {e}")
+        print(f"[STARTUP LOG] Preloaded {len(names)} modules in {time.perf_counter() - started:.2f}s")
+
+    threading.Thread(target=preload, name="preload-modules", daemon=True).start()
+
+
+class CachedAgent:
+    """An Agent plus the lock that keeps one session's turns from overlapping."""
+
+    def __init__(self, agent, session_manager):
+        self.agent = agent
+        self.session_manager = session_manager
+        self.lock = threading.Lock()
+
+
+class StageTimingHooks:
+    """Strands hook provider that times model and tool calls as metrics stages."""
+
+    def register_hooks(self, registry, **kwargs):
+        from strands.hooks import (
+            AfterModelCallEvent,
+            AfterToolCallEvent,
+            BeforeModelCallEvent,
+            BeforeToolCallEvent,
+        )
+
+        registry.add_callback(BeforeModelCallEvent, self._model_started)
+        registry.add_callback(AfterModelCallEvent, self._model_finished)
+        registry.add_callback(BeforeToolCallEvent, self._tool_started)
+        registry.add_callback(AfterToolCallEvent, self._tool_finished)
+
+    def _model_started(self, event):
+        event.invocation_state["_model_started"] = time.perf_counter()
+
+    def _model_finished(self, event):
+        started = event.invocation_state.pop("_model_started", None)
+        if started is not None:
+            error = {"error": type(event.exception).__name__} if event.exception else {}
+            record_span("model.call", started, **error)
+
+    def _tool_started(self, event):
+        event.invocation_state.setdefault("_tools_started", {})[event.tool_use["toolUseId"]] = time.perf_counter()
+
+    def _tool_finished(self, event):
+        started = event.invocation_state.get("_tools_started", {}).pop(event.tool_use["toolUseId"], None)
+        if started is not None:
+            error = {"error": type(event.exception).__name__} if event.exception else {}
+            record_span("tool.call", started, tool=event.tool_use["name"], **error)
+
+
+def timed_memory_retrieval(session_manager):
+    """Time an AgentCore memory session manager's retrieval as the "memory.retrieve" stage.
+
+    Call it before the Agent is built: the manager binds the method when
+    its hooks are registered.
+    """
+    retrieve = session_manager.retrieve_customer_context
+
+    def timed_retrieve(event):
+        with span("memory.retrieve"):
+            return retrieve(event)
+
+    session_manager.retrieve_customer_context = timed_retrieve
+    return session_manager
+
+
+def close_cached_agent(key, cached):
+    """``on_evict`` hook: flush and close the session manager of an idle agent."""
+    close = getattr(cached.session_manager, "close", None)
+    if close:
+        close()
+
+
+def start_code_interpreter(session_id, region_name=None):
+    """A CodeInterpreter client with a started sandbox session for ``session_id``."""
+    from bedrock_agentcore.tools.code_interpreter_client import CodeInterpreter
+
+    client = CodeInterpreter(region_name)
+    client.start(
+        name=f"session_{session_id[:30]}",
+        session_timeout_seconds=CODE_INTERPRETER_SESSION_TIMEOUT_SECONDS,
+    )
+    return client
+
+
+def stop_code_interpreter(key, client):
+    """``on_evict`` hook: stop an idle code-interpreter session."""
+    client.stop()
@@ -0,0 +1,327 @@
+import contextvars
+import multiprocessing
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+import os
+from cache import LRUBackend, ResultCache, make_backend
+from http_client import HttpClient, RateLimiter
+from metrics import incr, span, timed
+from request_context import emit_event
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+# Point LINKEDIN_HOST at benchmarks/linkedin_standin.py to scrape offline.
+LINKEDIN_HOST = os.environ.get("LINKEDIN_HOST", "https://www.linkedin.com").rstrip("/")
+BASE_URL = f"{LINKEDIN_HOST}/jobs-guest/jobs/api/seeMoreJobPostings/search"
+JOB_POSTING_URL = f"{LINKEDIN_HOST}/jobs-guest/jobs/api/jobPosting/{{job_id}}"
+ROLE = "Data Scientist"
+LOCATION = "United States"
+MAX_PAGES = 2  # scrape first 2 pages
+PAGE_SIZE = 25  # job cards per listing page
+# Open-ended crawls (fresh_target / time_budget) stop here at the latest;
+# the guest search API serves about 1000 results per query.
+LISTING_MAX_PAGES = 40
+
+# Detail pages are fetched by a small thread pool; the rate limiter below is
+# what keeps us polite, not the pool size.
+MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", "4"))
+REQUESTS_PER_SECOND = float(os.environ.get("SCRAPER_REQUESTS_PER_SECOND", "1"))
+
+# Shared HTTP connection pool and retry policy (see http_client.HttpClient)
+HTTP_POOL_SIZE = int(os.environ.get("SCRAPER_HTTP_POOL_SIZE", str(MAX_WORKERS + 2)))
+HTTP_MAX_RETRIES = int(os.environ.get("SCRAPER_HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = 1.0  # seconds; doubled on every retry
+HTTP_BACKOFF_MAX = 30.0
+HTTP_TIMEOUT = 15
+
+# lxml parses several times faster than the pure-Python html.parser; use it
+# when it is installed.
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = os.environ.get("SCRAPER_HTML_PARSER", "lxml")
+except ImportError:
+    HTML_PARSER = os.environ.get("SCRAPER_HTML_PARSER", "html.parser")
+# Worker processes for STREAM_PARSE_IN_POOL below
+PARSE_PROCESSES = int(os.environ.get("SCRAPER_PARSE_PROCESSES", "0")) or None  # None = cpu count
+# The streaming pipeline parses one page at a time; sending each page to the
+# process pool only pays off with html.parser and many concurrent fetches.
+STREAM_PARSE_IN_POOL = os.environ.get("SCRAPER_STREAM_PARSE_IN_POOL", "0") == "1"
+
+# Parsed job postings are cached by job_id so overlapping role searches
+# ("data scientist", "ML engineer", ...) don't download the same posting twice.
+JOB_CACHE_BACKEND = os.environ.get("JOB_CACHE_BACKEND", "memory")  # memory | file | dynamodb
+JOB_CACHE_MAX_ENTRIES = int(os.environ.get("JOB_CACHE_MAX_ENTRIES", "5000"))
+JOB_DETAIL_TTL_SECONDS = 3 * 24 * 60 * 60  # 3 days
+
+
+http = HttpClient(
+    pool_size=HTTP_POOL_SIZE,
+    max_retries=HTTP_MAX_RETRIES,
+    backoff_base=HTTP_BACKOFF_BASE,
+    backoff_max=HTTP_BACKOFF_MAX,
+    timeout=HTTP_TIMEOUT,
+    rate_limiter=RateLimiter(REQUESTS_PER_SECOND),
+)
+
+job_cache = ResultCache(
+    LRUBackend(JOB_CACHE_MAX_ENTRIES)
+    if JOB_CACHE_BACKEND == "memory"
+    else make_backend(JOB_CACHE_BACKEND),
+    ttl=JOB_DETAIL_TTL_SECONDS,
+    namespace="job",
+)
+
+
+# --------------------------------
+# HELPER FUNCTIONS
+# --------------------------------
+
+
+def iter_job_ids(role, location, pages=1, known=None, known_found=None, stop_at_known=False,
+                 fresh_target=None, deadline=None):
+    """Yield job IDs from LinkedIn guest job listings, page by page.
+
+    IDs already yielded are skipped, so callers can start fetching details as
+    soon as the first page arrives without seeing duplicates. ``pages`` is an
+    upper bound: paging stops early once a page brings no IDs we have not
+    seen in this crawl (LinkedIn serves empty or repeated pages past the end).
+
+    IDs in ``known`` (e.g. the job store's index) are not yielded; they are
+    appended to ``known_found`` if it is given. With ``stop_at_known``, a
+    page with nothing but known IDs also ends the crawl. Paging stops once
+    ``fresh_target`` IDs were yielded, or when ``time.monotonic()`` passes
+    ``deadline``.
+    """
+    seen = set()
+    known = known or ()
+    fresh = 0
+
+    for page in range(pages):
+        if deadline is not None and time.monotonic() >= deadline:
+            print(f"⏱️ Time budget spent after {page} pages")
+            return
+        start = page * PAGE_SIZE
+        url = f"{BASE_URL}?keywords={role.replace(' ', '%20')}&location={location.replace(' ', '%20')}&start={start}"
+        print(f"Fetching: {url}")
+        with span("listing.fetch"):
+            response = http.get(url)
+        if response.status_code != 200:
+            print(f"⚠️ Skipped page {page} — status code {response.status_code}")
+            continue
+
+        with span("listing.parse"):
+            from bs4 import BeautifulSoup  # deferred: only scraping needs it
+
+            soup = BeautifulSoup(response.text, HTML_PARSER)
+            page_ids = [
+                div["data-entity-urn"].split(":")[-1]
+                for div in (li.find("div", {"class": "base-card"}) for li in soup.find_all("li"))
+                if div and div.get("data-entity-urn")
+            ]
+        emit_event("progress", stage="listing", page=page + 1, job_ids=len(page_ids))
+        new_on_page = fresh_on_page = 0
+        for job_id in page_ids:
+            if job_id in seen:
+                continue
+            seen.add(job_id)
+            new_on_page += 1
+            if job_id in known:
+                if known_found is not None:
+                    known_found.append(job_id)
+                continue
+            fresh_on_page += 1
+            fresh += 1
+            yield job_id
+            if fresh_target is not None and fresh >= fresh_target:
+                return
+
+        if not new_on_page:
+            print(f"Page {page} had no new job IDs; stopping")
+            return
+        if stop_at_known and not fresh_on_page:
+            print(f"Page {page} had only postings we already have; stopping")
+            return
+
+
+def fetch_job_html(job_id):
+    """Download a job posting; returns ``(job_id, html, fetched_at)`` or None."""
+    job_url = JOB_POSTING_URL.format(job_id=job_id)
+    with span("detail.fetch"):
+        res = http.get(job_url)
+    if res.status_code != 200:
+        return None
+    return job_id, res.text, datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+
+@timed("detail.parse")
+def parse_job_html(job_id, html, fetched_at):
+    """Build the job dict from a posting's HTML, parsing the document once."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    def extract_text(selector, class_name):
+        tag = soup.find(selector, {"class": class_name})
+        return tag.text.strip() if tag else None
+
+    markup = soup.find("div", {"class": "show-more-less-html__markup"})
+    job = {
+        "job_id": job_id,
+        "title": extract_text("h2", "top-card-layout__title"),
+        "company": extract_text("a", "topcard__org-name-link"),
+        # The text of the description div, taken from the one parse rather
+        # than by serializing the tag and parsing it again. A missing div
+        # used to come out as the string "None"; keep that so stored rows
+        # stay comparable.
+        "description": _collapse_whitespace(markup.get_text(" ")) if markup else "None",
+        "url": f"https://www.linkedin.com/jobs/view/{job_id}",
+        "fetched_at": fetched_at,
+    }
+    return job
+
+
+def _parse_page(page):
+    """Process-pool worker: parse one page, reporting errors instead of raising."""
+    try:
+        return parse_job_html(*page), None
+    except Exception as e:
+        return None, f"parse failed: {type(e).__name__}: {e}"
+
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool(processes=PARSE_PROCESSES):
+    """Process pool shared by every parse call, started on first use.
+
+    Workers come from a forkserver (spawn where that is unavailable) rather
+    than fork(), because the fetch threads are usually running when the pool
+    starts and forking a threaded process can copy held locks.
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=processes or os.cpu_count() or 1, mp_context=context
+            )
+        return _parse_pool
+
+
+def _collapse_whitespace(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _load_job(job_id):
+    """Cached job dict for ``job_id``, or fetch and parse it.
+
+    Returns ``(job, error, from_cache)``; never raises.
+    """
+    job = job_cache.get(job_id)
+    incr("cache", namespace="job", result="hit" if job else "miss")
+    if job:
+        return job, None, True
+    try:
+        page = fetch_job_html(job_id)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", False
+    if page is None:
+        return None, "no details returned", False
+    if STREAM_PARSE_IN_POOL:
+        with span("detail.parse"):  # the worker's own span stays in the worker
+            job, error = _get_parse_pool().submit(_parse_page, page).result()
+    else:
+        job, error = _parse_page(page)
+    if job:
+        job_cache.set(job_id, job)
+    return job, error, False
+
+
+def iter_job_details(job_ids, max_workers=MAX_WORKERS, failures=None, deadline=None):
+    """Yield job dicts for ``job_ids`` in order, fetching them concurrently.
+
+    ``job_ids`` may be a generator that is still paging through listings:
+    details are requested as IDs arrive, with at most ``2 * max_workers`` in
+    flight, so memory stays flat however many pages are scraped. Postings
+    fetched within ``JOB_DETAIL_TTL_SECONDS`` come from ``job_cache``.
+
+    IDs that fail are skipped and, if ``failures`` is given, recorded there
+    with a short reason. One bad posting never stops the rest of the stream.
+
+    Once ``time.monotonic()`` passes ``deadline`` no new IDs are taken from
+    ``job_ids``; details already in flight are still yielded.
+    """
+    window = 2 * max(1, max_workers)
+    pending = deque()
+    seen = set()
+    stats = {"cached": 0, "fetched": 0}
+
+    def drain_one():
+        job_id, future = pending.popleft()
+        job, error, from_cache = future.result()
+        stats["cached" if from_cache else "fetched"] += 1
+        if error:
+            if failures is not None:
+                failures[job_id] = error
+            return None
+        return job
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for job_id in job_ids:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if job_id in seen:
+                continue
+            seen.add(job_id)
+            # run in a copy of our context so spans land in the caller's trace
+            pending.append((job_id, pool.submit(contextvars.copy_context().run, _load_job, job_id)))
+            # yield finished jobs as soon as the head of the line is ready
+            while pending and (len(pending) >= window or pending[0][1].done()):
+                job = drain_one()
+                if job:
+                    yield job
+        while pending:
+            job = drain_one()
+            if job:
+                yield job
+
+    print(f"[CACHE LOG] {stats['cached']} job details cached, fetched {stats['fetched']}")
+
+
+def iter_jobs(role=ROLE, location=LOCATION, pages=MAX_PAGES, max_workers=MAX_WORKERS, failures=None,
+              known=None, known_found=None, stop_at_known=False, fresh_target=None, time_budget=None):
+    """Stream job dicts: listing pages -> IDs -> details, all overlapped.
+
+    ``known``, ``known_found``, ``stop_at_known`` and ``fresh_target`` are
+    passed on to ``iter_job_ids``. Setting ``fresh_target`` or
+    ``time_budget`` (seconds for the whole scrape) makes the crawl
+    open-ended: it pages on up to ``LISTING_MAX_PAGES`` instead of
+    ``pages`` until enough unseen postings were found or time is up.
+    """
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    if fresh_target is not None or time_budget is not None:
+        pages = max(pages, LISTING_MAX_PAGES)
+    job_ids = iter_job_ids(
+        role, location, pages, known=known, known_found=known_found, stop_at_known=stop_at_known,
+        fresh_target=fresh_target, deadline=deadline,
+    )
+    return iter_job_details(job_ids, max_workers=max_workers, failures=failures, deadline=deadline)
+
+
+def scrape_jobs(role=ROLE, location=LOCATION, pages=MAX_PAGES, max_workers=MAX_WORKERS):
+    """Scrape and compile job data."""
+    failures = {}
+    jobs = list(iter_jobs(role, location, pages, max_workers=max_workers, failures=failures))
+    print(f"Scraped {len(jobs)} jobs, {len(failures)} failed")
+    for job_id, error in failures.items():
+        print(f"⚠️ Skipped job {job_id} — {error}")
+    return jobs
+
@@ -0,0 +1,152 @@
+"""
+Batch skill extraction over job frames.
+
+``extract_skill_matrix`` turns a DataFrame, Series or Arrow table of job
+descriptions into a sparse job x skill indicator matrix in one pass.
+Aggregates are then matrix products instead of re-scans of the text:
+
+    counts          column sums
+    co-occurrence   X.T @ X
+    per company     G.T @ X, with G the job x company one-hot matrix
+
+Scanning the text is the only per-row cost; large batches can be split
+over a process pool with ``processes``.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from metrics import timed
+from skills import get_skill_matcher
+
+# below this many distinct descriptions a process pool costs more than it saves
+POOL_MIN_TEXTS = 5000
+
+
+def _as_series(data, column):
+    """Text column of a DataFrame / Arrow table, or a Series / Arrow array as is."""
+    if hasattr(data, "schema") and hasattr(data, "column"):  # pyarrow.Table
+        data = data.column(column)
+    if hasattr(data, "to_pandas"):  # pyarrow (Chunked)Array
+        data = data.to_pandas()
+    if isinstance(data, pd.DataFrame):
+        data = data[column]
+    return pd.Series(data)
+
+
+class SkillMatrix:
+    """Sparse job x skill indicator matrix with its row and column labels."""
+
+    def __init__(self, matrix, skills, index):
+        self.matrix = matrix  # scipy.sparse.csr_matrix of 0/1, shape (jobs, skills)
+        self.skills = skills
+        self.index = index
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def counts(self):
+        """Number of jobs mentioning each skill, most common first."""
+        counts = np.asarray(self.matrix.sum(axis=0)).ravel()
+        return pd.Series(counts, index=self.skills).sort_values(ascending=False, kind="stable")
+
+    def top(self, n=10):
+        return self.counts().head(n)
+
+    def cooccurrence(self):
+        """Skill x skill DataFrame: jobs mentioning both (diagonal: either alone)."""
+        x = self.matrix.astype(np.int32)
+        return pd.DataFrame((x.T @ x).toarray(), index=self.skills, columns=self.skills)
+
+    def by(self, labels):
+        """Group x skill DataFrame of job counts, grouping rows by ``labels``.
+
+        ``labels`` is one value per job (e.g. the company column); jobs with a
+        missing label are left out.
+        """
+        codes, groups = pd.factorize(pd.Series(labels).to_numpy())
+        keep = codes >= 0
+        onehot = sparse.csr_matrix(
+            (np.ones(keep.sum(), dtype=np.int32), (np.flatnonzero(keep), codes[keep])),
+            shape=(self.matrix.shape[0], len(groups)),
+        )
+        return pd.DataFrame((onehot.T @ self.matrix.astype(np.int32)).toarray(), index=groups, columns=self.skills)
+
+    def to_frame(self):
+        """Dense boolean DataFrame; only for small matrices."""
+        return pd.DataFrame(self.matrix.toarray().astype(bool), index=self.index, columns=self.skills)
+
+
+def _scan_texts(matcher, texts, column_of):
+    """``(rows, cols)`` arrays of the skills found in each of ``texts``."""
+    texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+    rows, cols = [np.empty(0, np.int64)], [np.empty(0, np.int64)]
+    for pattern, implied, fold in matcher.scanners:
+        keyword_ids = {
+            keyword: [column_of[name] for name in names]
+            for keyword, names in implied.items()
+        }
+        found = (texts.str.lower() if fold else texts).str.findall(pattern)
+        # one row per (text, keyword), then per skill the keyword stands for
+        ids = found.explode().dropna().map(keyword_ids).explode()
+        rows.append(ids.index.to_numpy(dtype=np.int64))
+        cols.append(ids.to_numpy(dtype=np.int64))
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def _scan_in_pool(matcher, texts, column_of, processes):
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    chunks = np.array_split(np.arange(len(texts)), processes * 4)
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        futures = [
+            (chunk[0], pool.submit(_scan_texts, matcher, texts.iloc[chunk[0]:chunk[-1] + 1].tolist(), column_of))
+            for chunk in chunks if len(chunk)
+        ]
+        rows, cols = [], []
+        for offset, future in futures:
+            chunk_rows, chunk_cols = future.result()
+            rows.append(chunk_rows + offset)
+            cols.append(chunk_cols)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+@timed("skills.matrix")
+def extract_skill_matrix(data, column="description", matcher=None, processes=None):
+    """Job x skill SkillMatrix for every row of ``data``.
+
+    ``data`` is a DataFrame or Arrow table (``column`` holds the text) or a
+    Series / Arrow array of texts. Missing or non-string descriptions give
+    empty rows. Identical descriptions are scanned once; with ``processes``
+    > 1, large batches are scanned by that many worker processes.
+    """
+    matcher = matcher or get_skill_matcher()
+    texts = _as_series(data, column)
+    skills = sorted(matcher.categories)
+    column_of = {name: i for i, name in enumerate(skills)}
+
+    # scan each distinct description once
+    codes, uniques = pd.factorize(texts.where(texts.map(type) == str))
+    uniques = pd.Series(uniques, dtype=object)
+    if processes and processes > 1 and len(uniques) >= POOL_MIN_TEXTS:
+        rows, cols = _scan_in_pool(matcher, uniques, column_of, processes)
+    else:
+        rows, cols = _scan_texts(matcher, uniques, column_of)
+    per_text = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(uniques), len(skills))
+    )
+    per_text.sum_duplicates()  # a skill mentioned several times counts once
+    per_text.data[:] = 1
+
+    # expand unique texts back to jobs; rows with no text stay empty
+    has_text = codes >= 0
+    expand = sparse.csr_matrix(
+        (np.ones(has_text.sum(), dtype=np.int8), (np.flatnonzero(has_text), codes[has_text])),
+        shape=(len(codes), len(uniques)),
+    )
+    matrix = (expand @ per_text).tocsr()
+    return SkillMatrix(matrix, skills, texts.index)
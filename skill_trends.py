@@ -0,0 +1,263 @@
+"""
+Incremental per-role, per-day skill counters over the job store.
+
+Every Parquet part in the job store holds postings for one role and one
+fetch date and never changes once written. ``SkillTrends.sync`` counts the
+skills in parts it has not seen yet and adds them to daily counters, so new
+postings are counted exactly once, whoever wrote them (the agent, check.py,
+another container on the same volume). Within a part, near-duplicates of
+a posting already counted (see dedup.py) are not counted again.
+
+Queries work on prefix sums of the daily counters: any window is the
+difference of two cumulative counters, so top-K and trend queries cost the
+same however many postings or days are stored.
+"""
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, timedelta
+import json
+import os
+import tempfile
+import threading
+import time
+
+from dedup import DEDUP_ENABLED, ScrapeDedup, dedup_index
+from job_store import job_store, role_slug
+from skills import get_skill_matcher
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+# re-list the store for new parts at most this often on the query path
+TRENDS_SYNC_SECONDS = 30
+
+
+class _RoleCounters:
+    """Daily job and skill counts for one role, with lazily built prefix sums."""
+
+    def __init__(self, jobs=None, skills=None):
+        self.jobs = dict(jobs or {})  # day -> postings
+        self.skills = {day: Counter(counts) for day, counts in (skills or {}).items()}  # day -> Counter
+        self._cumulative = None
+
+    def add(self, day, jobs, skill_counts):
+        self.jobs[day] = self.jobs.get(day, 0) + jobs
+        self.skills.setdefault(day, Counter()).update(skill_counts)
+        self._cumulative = None
+
+    def _prefix_sums(self):
+        if self._cumulative is None:
+            days = sorted(self.jobs)
+            jobs, skills = [], []
+            running_jobs, running_skills = 0, Counter()
+            for day in days:
+                running_jobs += self.jobs[day]
+                running_skills = running_skills + self.skills.get(day, Counter())
+                jobs.append(running_jobs)
+                skills.append(running_skills)
+            self._cumulative = (days, jobs, skills)
+        return self._cumulative
+
+    def window(self, since, until):
+        """``(skill Counter, postings)`` for days in [since, until]."""
+        days, jobs, skills = self._prefix_sums()
+        hi = bisect_right(days, until) - 1
+        lo = bisect_left(days, since) - 1
+        if hi < 0 or hi <= lo:
+            return Counter(), 0
+        if lo < 0:
+            return Counter(skills[hi]), jobs[hi]
+        return skills[hi] - skills[lo], jobs[hi] - jobs[lo]
+
+    @property
+    def last_day(self):
+        return max(self.jobs) if self.jobs else None
+
+    def to_json(self):
+        return {"jobs": self.jobs, "skills": {day: dict(c) for day, c in self.skills.items()}}
+
+
+def _shift(day, days):
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+class SkillTrends:
+    """Skill counts per role and day, kept in step with a JobStore.
+
+    State lives in ``<store>/_trends.json``: the counters plus the parts
+    already counted. Skills are counted with the taxonomy current at the
+    time a part is first seen; taxonomy edits do not recount history.
+
+    Queries read the counters under the same lock ``sync`` holds while
+    adding to them, since both run on request threads.
+    """
+
+    def __init__(self, store=None, path=None, matcher=None, sync_interval=TRENDS_SYNC_SECONDS):
+        self.store = store or job_store
+        self.path = path or os.path.join(self.store.directory, "_trends.json")
+        self.matcher = matcher
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._next_sync = 0.0
+        self._roles, self._counted = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}, set()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            roles = {slug: _RoleCounters(**counters) for slug, counters in data["roles"].items()}
+            return roles, set(data["counted"])
+        except Exception as e:
+            print(f"[TRENDS ERROR] Ignoring unreadable {self.path}, recounting the store: {e}")
+            return {}, set()
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        data = {
+            "roles": {slug: counters.to_json() for slug, counters in self._roles.items()},
+            "counted": sorted(self._counted),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def sync(self, force=False):
+        """Count parts added to the store since the last sync; returns new postings counted."""
+        if not force and time.monotonic() < self._next_sync:
+            return 0
+        import pyarrow.parquet as pq
+
+        from skill_matrix import extract_skill_matrix
+
+        with self._lock:
+            self._next_sync = time.monotonic() + self.sync_interval
+            matcher = self.matcher or get_skill_matcher()
+            added = skipped = 0
+            for slug, day, path in self.store.parts():
+                key = os.path.relpath(path, self.store.directory)
+                if key in self._counted:
+                    continue
+                try:
+                    table = pq.read_table(path, columns=["job_id", "description"])
+                    if DEDUP_ENABLED:
+                        # a part is one scrape's postings; each cluster counts once in it
+                        dedup = ScrapeDedup(dedup_index(slug, self.store))
+                        keep = [not dedup.is_duplicate(job) for job in table.to_pylist()]
+                        table = table.filter(keep)
+                    counts = extract_skill_matrix(table, matcher=matcher).counts()
+                except Exception as e:
+                    # parts never change, so a bad one stays bad: count it as
+                    # empty rather than failing every sync on it
+                    print(f"[TRENDS ERROR] Skipping unreadable part {key}: {e}")
+                    self._counted.add(key)
+                    skipped += 1
+                    continue
+                self._roles.setdefault(slug, _RoleCounters()).add(
+                    day, table.num_rows, {skill: int(n) for skill, n in counts.items() if n}
+                )
+                self._counted.add(key)
+                added += table.num_rows
+            if added:
+                print(f"[TRENDS LOG] Counted skills in {added} new postings")
+            if added or skipped:
+                try:
+                    self._save()
+                except OSError as e:
+                    # the counts stay in memory and are saved with the next sync
+                    print(f"[TRENDS ERROR] saving {self.path} failed: {e}")
+            return added
+
+    def _role(self, role):
+        try:
+            self.sync()
+        except Exception as e:
+            print(f"[TRENDS ERROR] sync failed, answering from the counts so far: {e}")
+        return self._roles.get(role_slug(role))
+
+    def last_day(self, role):
+        counters = self._role(role)
+        with self._lock:
+            return counters.last_day if counters else None
+
+    def window(self, role, days=30, until=None):
+        """``(skill Counter, postings, since, until)`` for the ``days`` up to ``until``.
+
+        ``until`` defaults to the role's most recent fetch date.
+        """
+        counters = self._role(role)
+        with self._lock:
+            if counters is None or not counters.jobs:
+                return Counter(), 0, None, None
+            until = until or counters.last_day
+            since = _shift(until, 1 - days)
+            skills, jobs = counters.window(since, until)
+        return skills, jobs, since, until
+
+    def top_skills(self, role, k=10, days=30, until=None):
+        """Top ``k`` skills over ``days`` days, with the preceding period for comparison.
+
+        Returns a dict with the window bounds, posting totals of both periods
+        and ``skills`` as ``[name, postings, previous period postings]``.
+        """
+        skills, jobs, since, until = self.window(role, days, until)
+        report = {"role": role, "days": days, "since": since, "until": until, "jobs": jobs,
+                  "previous_jobs": 0, "skills": []}
+        if jobs:
+            previous, report["previous_jobs"], _, _ = self.window(role, days, _shift(since, -1))
+            report["skills"] = [[name, count, previous.get(name, 0)] for name, count in skills.most_common(k)]
+        return report
+
+    def trend(self, role, skill, days=90, bucket_days=7, until=None):
+        """``[(bucket_start, postings mentioning skill, postings)]``, oldest first."""
+        counters = self._role(role)
+        buckets = []
+        with self._lock:
+            if counters is None or not counters.jobs:
+                return []
+            until = until or counters.last_day
+            for end_offset in range(0, days, bucket_days):
+                end = _shift(until, -end_offset)
+                start = _shift(end, 1 - min(bucket_days, days - end_offset))
+                skills, jobs = counters.window(start, end)
+                buckets.append((start, skills.get(skill, 0), jobs))
+        return buckets[::-1]
+
+
+def _pct(part, whole):
+    return round(100 * part / whole) if whole else 0
+
+
+def render_top_skills(report):
+    """Plain-text top-skills report for the agent."""
+    if not report["jobs"]:
+        return f"No stored '{report['role']}' postings yet; scrape the role first."
+    lines = [
+        f"Top skills in {report['jobs']} '{report['role']}' postings fetched "
+        f"{report['since']}..{report['until']} (vs the {report['previous_jobs']} postings "
+        f"of the {report['days']} days before):"
+    ]
+    for name, count, previous in report["skills"]:
+        share = _pct(count, report["jobs"])
+        if report["previous_jobs"]:
+            change = share - _pct(previous, report["previous_jobs"])
+            lines.append(f"- {name}: {count} ({share}%, {change:+d} pts)")
+        else:
+            lines.append(f"- {name}: {count} ({share}%)")
+    return "\n".join(lines)
+
+
+def render_skill_trend(role, skill, buckets):
+    """Plain-text trend of one skill's share of postings, per bucket."""
+    if not any(jobs for _, _, jobs in buckets):
+        return f"No stored '{role}' postings yet; scrape the role first."
+    lines = [f"Share of '{role}' postings mentioning {skill}:"]
+    for start, count, jobs in buckets:
+        lines.append(f"- from {start}: {count} of {jobs} ({_pct(count, jobs)}%)" if jobs else f"- from {start}: no postings")
+    return "\n".join(lines)
+
+
+skill_trends = SkillTrends()
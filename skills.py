@@ -0,0 +1,308 @@
+import json
+import os
+import re
+import threading
+import time
+
+from metrics import span, timed
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+SKILL_TAXONOMY_FILE = os.environ.get(
+    "SKILL_TAXONOMY_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json"),
+)
+# How often (seconds) the taxonomy file is checked for changes.
+TAXONOMY_RELOAD_SECONDS = int(os.environ.get("SKILL_TAXONOMY_RELOAD_SECONDS", "30"))
+SKILL_CATEGORIES = {"technical", "soft"}
+
+# Keywords are delimited by anything that is not a word character (or '&', so
+# "R&D" is not the R language). Unlike \b this also works for keywords that
+# start or end with a symbol: "c++", "c#", ".net".
+_LEFT = r"(?<![\w&])"
+_RIGHT = r"(?![\w&])"
+
+
+def load_taxonomy(path=SKILL_TAXONOMY_FILE):
+    """Read and validate the skill taxonomy file.
+
+    The file holds ``{"skills": [{"name", "category", "aliases",
+    "case_sensitive_aliases"}]}``. Aliases are matched case-insensitively;
+    ``case_sensitive_aliases`` are for short names that collide with
+    ordinary words ("R", "Rust", "Swift").
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    skills, seen = [], set()
+    for entry in data["skills"]:
+        name = entry["name"]
+        category = entry.get("category", "technical")
+        if name in seen:
+            raise ValueError(f"Duplicate skill '{name}' in {path}")
+        if category not in SKILL_CATEGORIES:
+            raise ValueError(f"Skill '{name}' has unknown category '{category}'")
+        aliases = entry.get("aliases", [])
+        case_sensitive = entry.get("case_sensitive_aliases", [])
+        if not aliases and not case_sensitive:
+            raise ValueError(f"Skill '{name}' has no aliases")
+        seen.add(name)
+        skills.append({
+            "name": name,
+            "category": category,
+            "aliases": aliases,
+            "case_sensitive_aliases": case_sensitive,
+        })
+    return skills
+
+
+def _build_trie(keywords):
+    """Nested dicts keyed by character; ``""`` marks the end of a keyword."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return trie
+
+
+def _trie_prefixes(trie, keyword):
+    """Return the other keywords in ``trie`` that are prefixes of ``keyword``."""
+    prefixes, node = [], trie
+    for i, ch in enumerate(keyword):
+        if i and "" in node:
+            prefixes.append(keyword[:i])
+        node = node[ch]
+    return prefixes
+
+
+def _trie_regex(trie):
+    """Build a regex matching any keyword in ``trie``.
+
+    "java" and "javascript" become ``java(?:script)?``, so the engine walks
+    one branch per character instead of trying every keyword in turn; cost
+    grows with keyword length, not with the number of keywords. Longer
+    keywords are tried before their prefixes.
+    """
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Precompiled single-pass matcher for a skill taxonomy.
+
+    All aliases are folded into one trie-factored regex (plus a second one
+    for case-sensitive aliases), so each text is scanned once and the cost
+    per character stays flat however many skills the taxonomy holds.
+    """
+
+    def __init__(self, skills):
+        self.categories = {skill["name"]: skill["category"] for skill in skills}
+        self._skills = {skill["name"].lower(): skill for skill in skills}
+        insensitive, sensitive = {}, {}
+        for skill in skills:
+            for alias in skill["aliases"]:
+                insensitive.setdefault(alias.lower(), set()).add(skill["name"])
+            for alias in skill["case_sensitive_aliases"]:
+                sensitive.setdefault(alias, set()).add(skill["name"])
+
+        self._scanners = [
+            self._scanner(keywords, fold)
+            for keywords, fold in ((insensitive, True), (sensitive, False))
+            if keywords
+        ]
+
+    @staticmethod
+    def _scanner(skill_by_keyword, fold):
+        trie = _build_trie(skill_by_keyword)
+        # Zero-width lookahead so overlapping keywords ("node.js" and "js")
+        # are all seen: every boundary is tried as a start position.
+        # Case-insensitive keywords are matched against lowercased text,
+        # which re scans several times faster than it does with IGNORECASE.
+        pattern = re.compile(_LEFT + "(?=(" + _trie_regex(trie) + ")" + _RIGHT + ")")
+        # At one start position the regex reports only the longest keyword.
+        # A shorter keyword that is a prefix of it matched too if the longer
+        # one continues with a boundary character ("machine learning" ->
+        # "machine"), which depends only on the keyword; resolve it here once.
+        right = re.compile(_RIGHT)
+        implied = {}
+        for keyword, names in skill_by_keyword.items():
+            implied[keyword] = set(names)
+            for prefix in _trie_prefixes(trie, keyword):
+                if right.match(keyword, len(prefix)):
+                    implied[keyword] |= skill_by_keyword[prefix]
+        return pattern, implied, fold
+
+    @property
+    def scanners(self):
+        """``(pattern, implied, fold)`` per scanner, for batch matching.
+
+        ``pattern.findall`` over the text (lowercased when ``fold``) yields
+        keywords; ``implied[keyword]`` is the set of skill names each stands for.
+        """
+        return self._scanners
+
+    def find_skills(self, text):
+        """Return the set of skill names mentioned in ``text``."""
+        found = set()
+        for pattern, implied, fold in self._scanners:
+            for keyword in set(pattern.findall(text.lower() if fold else text)):
+                found |= implied[keyword]
+        return found
+
+    def category(self, skill_name):
+        return self.categories.get(skill_name)
+
+    def _lookup(self, name):
+        skill = self._skills.get(name.lower())
+        if skill is None:
+            skill = next(
+                (s for s in self._skills.values() if name.lower() in map(str.lower, s["aliases"])),
+                None,
+            )
+        return skill
+
+    def canonical_name(self, name):
+        """Taxonomy name of the skill called (or aliased) ``name``, or None."""
+        skill = self._lookup(name)
+        return skill["name"] if skill else None
+
+    def skill_pattern(self, name):
+        """Regex matching any alias of the skill called (or aliased) ``name``.
+
+        Unknown names fall back to matching ``name`` itself as a keyword.
+        """
+        skill = self._lookup(name)
+        if skill is None:
+            alternatives = [re.escape(name)]
+        else:
+            alternatives = [re.escape(alias) for alias in skill["aliases"]]
+            alternatives += [f"(?-i:{re.escape(alias)})" for alias in skill["case_sensitive_aliases"]]
+        return re.compile(_LEFT + "(?:" + "|".join(alternatives) + ")" + _RIGHT, re.IGNORECASE)
+
+
+class TaxonomyWatcher:
+    """Keeps a SkillMatcher in sync with the taxonomy file.
+
+    The file is indexed once on construction. Afterwards its mtime is checked
+    at most every ``check_interval`` seconds and the matcher is rebuilt and
+    swapped in when it changed, so edits take effect without restarting the
+    runtime. A file that fails to load keeps the previous matcher.
+    """
+
+    def __init__(self, path=SKILL_TAXONOMY_FILE, check_interval=TAXONOMY_RELOAD_SECONDS):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = os.stat(path).st_mtime
+        self._matcher = self._build()
+        self._next_check = time.monotonic() + check_interval
+
+    def _build(self):
+        skills = load_taxonomy(self.path)
+        print(f"[SKILLS LOG] Indexed {len(skills)} skills from {self.path}")
+        return SkillMatcher(skills)
+
+    @property
+    def matcher(self):
+        if time.monotonic() >= self._next_check:
+            self._reload_if_changed()
+        return self._matcher
+
+    def _reload_if_changed(self):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_check:
+                return  # another thread just checked
+            self._next_check = now + self.check_interval
+            try:
+                mtime = os.stat(self.path).st_mtime
+                if mtime == self._mtime:
+                    return
+                self._matcher = self._build()
+                self._mtime = mtime
+            except Exception as e:
+                print(f"[SKILLS ERROR] Keeping previous taxonomy, reload failed: {e}")
+
+
+taxonomy = TaxonomyWatcher()
+
+
+def get_skill_matcher():
+    """Return the matcher for the current taxonomy file."""
+    return taxonomy.matcher
+
+
+class SkillTally:
+    """Running skill counts over a stream of job dicts.
+
+    ``tap`` passes jobs straight through while counting them, so skill
+    extraction can sit in the middle of a streaming scrape.
+    """
+
+    def __init__(self, matcher=None):
+        self.matcher = matcher or get_skill_matcher()
+        self.counts = {}
+        self.jobs = 0
+
+    def add(self, job):
+        """Count one job; returns the set of skills found in it."""
+        with span("skills.match"):
+            return self._add(job)
+
+    def _add(self, job):
+        if not isinstance(job, dict):
+            return set()  # Skip any item that isn't a dictionary
+
+        # Get the description string from the job dictionary
+        desc = job.get("description")
+
+        if not desc or not isinstance(desc, str):
+            return set()  # Skip if description is missing or not a string
+
+        self.jobs += 1
+        skills = self.matcher.find_skills(desc)
+        for skill in skills:
+            self.counts[skill] = self.counts.get(skill, 0) + 1
+        return skills
+
+    def top(self, n=5):
+        """The ``n`` most frequent skills so far, as ``[name, count]`` pairs."""
+        return [[name, count] for name, count in sorted(self.counts.items(), key=lambda item: -item[1])[:n]]
+
+    def tap(self, jobs):
+        for job in jobs:
+            self.add(job)
+            yield job
+
+
+@timed("skills.extract")
+def extract_skills_from_jobs(jobs_list: list) -> dict:
+    """
+    Extracts and counts predefined skills from a list of job dictionaries.
+
+    Args:
+        jobs_list: A list of 'job' dictionaries, where each dict is expected
+                   to have a 'description' key with a string value.
+
+    Returns:
+        A dictionary where keys are standardized skill names (e.g., "Python")
+        and values are the count of jobs mentioning that skill.
+    """
+    if not isinstance(jobs_list, list):
+        print("Error: Input must be a list of job dictionaries.")
+        return {}
+
+    tally = SkillTally()
+    for job in jobs_list:
+        tally.add(job)
+    return tally.counts
@@ -0,0 +1,193 @@
+"""
+Map-reduce summarization of long texts with a Bedrock model.
+
+Short inputs go to the model in one call, as before. Longer ones are split
+into chunks of at most SUMMARY_CHUNK_TOKENS on the coarsest boundary that
+fits (paragraphs, then lines, sentences, words). The chunks are summarized
+concurrently and the partial summaries are merged, repeating the merge
+step until the partials fit in one call.
+
+Every call is cached by a hash of the model, prompt and text, so
+summarizing the same postings again costs one cache lookup per chunk.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import hashlib
+import json
+import os
+import re
+import threading
+
+from cache import ResultCache, make_backend
+from job_summary import CHARS_PER_TOKEN, estimate_tokens
+from metrics import span
+from request_context import emit_event
+
+# --------------------------------
+# CONFIG
+# --------------------------------
+# inputs up to this size are summarized in a single call
+SUMMARY_SINGLE_CALL_TOKENS = int(os.environ.get("SUMMARY_SINGLE_CALL_TOKENS", "12000"))
+SUMMARY_CHUNK_TOKENS = int(os.environ.get("SUMMARY_CHUNK_TOKENS", "8000"))
+# concurrent invoke_model calls per process, across all requests
+SUMMARY_MAX_WORKERS = int(os.environ.get("SUMMARY_MAX_WORKERS", "8"))
+SUMMARY_CACHE_BACKEND = os.environ.get("SUMMARY_CACHE_BACKEND", "memory")  # memory | file | dynamodb
+SUMMARY_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
+
+SUMMARIZE_PROMPT = "Summarize the following text:\n\n{text}"
+CHUNK_PROMPT = (
+    "Summarize the following excerpt of a longer text. Keep names, numbers "
+    "and skills; they are merged with the other excerpts later.\n\n{text}"
+)
+MERGE_PROMPT = (
+    "The following are summaries of consecutive parts of one text. Combine "
+    "them into a single summary of the whole text:\n\n{text}"
+)
+
+# coarsest first; each piece keeps its trailing separator
+_BOUNDARIES = [
+    re.compile(r"(?<=\n\n)"),
+    re.compile(r"(?<=\n)"),
+    re.compile(r"(?<=[.!?]\s)"),
+    re.compile(r"(?<=\s)"),
+]
+
+
+def split_text(text, max_tokens=SUMMARY_CHUNK_TOKENS):
+    """Split ``text`` into chunks of at most ``max_tokens`` (estimated) tokens.
+
+    Pieces are cut at the coarsest boundary that makes them fit and packed
+    greedily, so chunks end on paragraph or sentence ends where possible.
+    Only a single word longer than ``max_tokens`` is cut mid-word. Nothing
+    is dropped: ``"".join(split_text(text))`` is ``text`` unless ``text`` is
+    blank.
+    """
+    if not text.strip():
+        return []
+    chunks = []
+    for chunk in _split(text, max_tokens, 0):
+        # whitespace-only chunks ride along with a neighbour rather than
+        # being sent to the model on their own
+        if chunks and (not chunk.strip() or not chunks[-1].strip()):
+            chunks[-1] += chunk
+        else:
+            chunks.append(chunk)
+    return chunks
+
+
+def _split(text, max_tokens, level):
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    if level == len(_BOUNDARIES):
+        size = max_tokens * CHARS_PER_TOKEN
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    chunks, current, current_tokens = [], [], 0
+    for piece in _BOUNDARIES[level].split(text):
+        if not piece:
+            continue
+        tokens = estimate_tokens(piece)
+        if tokens > max_tokens:
+            if current:
+                chunks.append("".join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split(piece, max_tokens, level + 1))
+            continue
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class MapReduceSummarizer:
+    """Summarizes texts of any length with ``model_id`` through ``invoke_model``.
+
+    ``client`` is a bedrock-runtime client (or anything with the same
+    ``invoke_model``); by default the process-wide one from runtime_cache is
+    used, created on first call. Chunk calls from all requests share one
+    pool of ``max_workers`` threads, which bounds the load on Bedrock.
+    """
+
+    def __init__(
+        self,
+        model_id,
+        client=None,
+        region_name=None,
+        chunk_tokens=SUMMARY_CHUNK_TOKENS,
+        single_call_tokens=SUMMARY_SINGLE_CALL_TOKENS,
+        max_workers=SUMMARY_MAX_WORKERS,
+        cache=None,
+    ):
+        self.model_id = model_id
+        self.region_name = region_name
+        self.chunk_tokens = chunk_tokens
+        self.single_call_tokens = max(single_call_tokens, chunk_tokens)
+        self.max_workers = max_workers
+        self.cache = cache or ResultCache(
+            make_backend(SUMMARY_CACHE_BACKEND), SUMMARY_CACHE_TTL_SECONDS, namespace="chunk-summary"
+        )
+        self._client = client
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from runtime_cache import get_client
+
+            self._client = get_client("bedrock-runtime", self.region_name)
+        return self._client
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="summarize")
+            return self._pool
+
+    def invoke(self, prompt):
+        """One invoke_model call; returns the model's text."""
+        with span("summarize.invoke"):
+            response = self.client.invoke_model(
+                modelId=self.model_id,
+                body=json.dumps({"messages": [{"role": "user", "content": prompt}]}),
+            )
+        result = json.loads(response["body"].read())
+        return result["output"]["message"]["content"][0]["text"]
+
+    def _cached(self, template, text):
+        digest = hashlib.sha256(f"{self.model_id}\0{template}\0{text}".encode("utf-8")).hexdigest()
+        return self.cache.get_or_compute(digest, lambda: self.invoke(template.format(text=text)))
+
+    def summarize(self, text):
+        """Summary of ``text``: one call if it is short, map-reduce otherwise."""
+        if estimate_tokens(text) <= self.single_call_tokens:
+            return self._cached(SUMMARIZE_PROMPT, text)
+
+        chunks = split_text(text, self.chunk_tokens)
+        print(f"[TOOL LOG] Summarizing {len(chunks)} chunks of ~{self.chunk_tokens} tokens")
+        partials = self._map(CHUNK_PROMPT, chunks)
+        # merge until the partial summaries fit in one call
+        while estimate_tokens("\n\n".join(partials)) > self.single_call_tokens and len(partials) > 1:
+            groups = split_text("\n\n".join(partials), self.chunk_tokens)
+            if len(groups) >= len(partials):
+                break  # summaries no longer shrink; merge what we have
+            partials = self._map(MERGE_PROMPT, groups)
+        with span("summarize.reduce"):
+            return self._cached(MERGE_PROMPT, "\n\n".join(partials))
+
+    def _map(self, template, texts):
+        """Summaries of ``texts``, in order, computed concurrently."""
+        # each task runs in a copy of our context so spans land in the caller's trace
+        futures = [
+            self.pool.submit(contextvars.copy_context().run, self._cached, template, text) for text in texts
+        ]
+        results = []
+        for done, future in enumerate(futures, 1):
+            results.append(future.result())
+            emit_event("progress", stage="summarize", chunks_done=done, chunks=len(futures))
+        return results
@@ -0,0 +1,310 @@
+"""ResultCache, its in-process coalescing, the DynamoDB backend and its leases (moto's in-process DynamoDB)."""
+import threading
+import time
+
+import boto3
+import pytest
+from moto import mock_aws
+
+import cache
+from cache import DynamoDBBackend, DynamoDBLease, LRUBackend, ResultCache, make_lease
+
+TABLE_NAME = "Job-market-agent-db"
+
+
+@pytest.fixture
+def table(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-2")
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-2")
+        yield dynamodb.create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[{"AttributeName": "role", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "role", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+
+
+@pytest.fixture
+def backend(table):
+    return DynamoDBBackend(table=table)
+
+
+class Compute:
+    """Counts calls; returns ``value``."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_get_set_delete(backend):
+    assert backend.get("missing") is None
+    value = {"role": "data scientist", "skills": [["Python", 3, 75, "technical"]], "share": 0.75}
+    backend.set("k", value, 1_700_000_000.9)
+    assert backend.get("k") == (value, 1_700_000_000)
+    backend.delete("k")
+    assert backend.get("k") is None
+    backend.delete("k")  # deleting a missing key is fine
+
+
+def test_timestamps_come_back_as_ints_not_decimals(backend, table):
+    backend.set("k", "v", 1_700_000_000)
+    raw = table.get_item(Key={"role": "k"})["Item"]["timestamp"]
+    assert type(raw).__name__ == "Decimal"
+    value, stored_at = backend.get("k")
+    assert type(stored_at) is int
+    # ResultCache does arithmetic with time.time() on it
+    assert time.time() - stored_at > 0
+
+
+def test_expire_after_sets_the_ttl_attribute(table):
+    DynamoDBBackend(table=table, expire_after=60).set("k", "v", 1_000)
+    assert table.get_item(Key={"role": "k"})["Item"]["expires_at"] == 1_060
+
+
+def test_item_without_payload_is_a_miss(backend, table):
+    table.put_item(Item={"role": "lease:k", "owner": "someone"})
+    assert backend.get("lease:k") is None
+
+
+def test_fresh_hit_skips_compute(backend):
+    results = ResultCache(backend, ttl=60, namespace="summary")
+    compute = Compute({"job_count": 3})
+    assert results.get_or_compute("k", compute) == {"job_count": 3}
+    assert results.get_or_compute("k", compute) == {"job_count": 3}
+    assert compute.calls == 1
+    assert backend.get("summary:k")[0] == {"job_count": 3}
+
+
+def test_stale_value_is_served_while_refreshing_in_background(backend):
+    results = ResultCache(backend, ttl=60, stale_ttl=60)
+    backend.set("k", "old", time.time() - 90)
+    compute = Compute("new")
+
+    assert results.get_or_compute("k", compute) == "old"
+    wait_for(lambda: backend.get("k")[0] == "new")
+    assert compute.calls == 1
+    assert results.get_or_compute("k", compute) == "new"
+    assert compute.calls == 1
+
+
+def test_entry_past_the_stale_window_is_recomputed_inline(backend):
+    results = ResultCache(backend, ttl=60, stale_ttl=60)
+    backend.set("k", "old", time.time() - 200)
+    assert results.get_or_compute("k", Compute("new")) == "new"
+    assert backend.get("k")[0] == "new"
+
+
+def test_none_is_passed_through_but_not_stored(backend):
+    results = ResultCache(backend, ttl=60)
+    compute = Compute(None)
+    assert results.get_or_compute("k", compute) is None
+    assert results.get_or_compute("k", compute) is None
+    assert compute.calls == 2
+    assert backend.get("k") is None
+
+
+def test_backend_errors_are_treated_as_a_miss(table):
+    # a table that doesn't exist: every call raises ResourceNotFoundException
+    results = ResultCache(DynamoDBBackend(table_name="no-such-table", region="us-east-2"), ttl=60)
+    compute = Compute("computed")
+    assert results.get_or_compute("k", compute) == "computed"
+    assert results.get("k") is None
+    results.set("k", "v")  # logged, not raised
+    assert compute.calls == 1
+
+
+def test_stale_refresh_errors_keep_serving_the_stale_value():
+    backend = LRUBackend()
+    results = ResultCache(backend, ttl=60, stale_ttl=60)
+    backend.set("k", "old", time.time() - 90)
+
+    def broken():
+        raise RuntimeError("scrape failed")
+
+    assert results.get_or_compute("k", broken) == "old"
+    wait_for(lambda: "k" not in results._refreshing)
+    assert results.get_or_compute("k", broken) == "old"
+
+
+def test_make_backend_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        cache.make_backend("redis")
+
+
+# --------------------------------
+# In-process coalescing
+# --------------------------------
+THREADS = 8
+
+
+def run_concurrently(results, compute, monkeypatch):
+    """Call ``get_or_compute("k", compute)`` from THREADS threads at once.
+
+    ``compute`` is held until every other thread has joined its flight.
+    Returns each thread's result or exception.
+    """
+    joined = []
+    monkeypatch.setattr(cache, "print", lambda *args: joined.append(args), raising=False)
+    release = threading.Event()
+    outcomes = [None] * THREADS
+
+    def held():
+        release.wait(5)
+        return compute()
+
+    def call(i):
+        try:
+            outcomes[i] = results.get_or_compute("k", held)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: sum("Joining" in str(args) for args in joined) == THREADS - 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_misses_compute_once(monkeypatch):
+    results = ResultCache(LRUBackend(), ttl=60)
+    compute = Compute("computed")
+    assert run_concurrently(results, compute, monkeypatch) == ["computed"] * THREADS
+    assert compute.calls == 1
+    assert results.get("k") == "computed"
+
+
+def test_the_leaders_error_reaches_every_waiter(monkeypatch):
+    results = ResultCache(LRUBackend(), ttl=60)
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise RuntimeError("scrape failed")
+
+    outcomes = run_concurrently(results, broken, monkeypatch)
+    assert len(calls) == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert results._flights._flights == {}  # the next call computes afresh
+
+
+# --------------------------------
+# Leases
+# --------------------------------
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_LEASE_POLL_SECONDS", 0.05)
+
+
+def lease_item(table, key):
+    return table.get_item(Key={"role": f"lease:{key}"}).get("Item")
+
+
+def test_acquire_contend_release(backend, table):
+    mine, theirs = DynamoDBLease(backend, 60), DynamoDBLease(backend, 60)
+    assert mine.acquire("k")
+    assert lease_item(table, "k")["owner"] == mine.owner
+    assert lease_item(table, "k")["expires_at"] == lease_item(table, "k")["lease_expires_at"]
+    assert not theirs.acquire("k")
+    assert not mine.acquire("k")  # not re-entrant either
+
+    theirs.release("k")  # not the holder: a no-op
+    assert lease_item(table, "k")["owner"] == mine.owner
+
+    mine.release("k")
+    assert lease_item(table, "k") is None
+    assert theirs.acquire("k")
+
+
+def test_expired_lease_is_taken_over(backend, table):
+    crashed, successor = DynamoDBLease(backend, 60), DynamoDBLease(backend, 60)
+    assert crashed.acquire("k")
+    table.update_item(
+        Key={"role": "lease:k"},
+        UpdateExpression="SET lease_expires_at = :past",
+        ExpressionAttributeValues={":past": int(time.time()) - 1},
+    )
+    assert successor.acquire("k")
+    assert lease_item(table, "k")["owner"] == successor.owner
+
+    crashed.release("k")  # its late release must not drop the successor's lease
+    assert lease_item(table, "k")["owner"] == successor.owner
+
+
+def test_leases_do_not_collide_with_cached_values(backend):
+    backend.set("k", "cached", time.time())
+    assert DynamoDBLease(backend).acquire("k")
+    assert backend.get("k")[0] == "cached"
+
+
+def test_holder_computes_and_releases(backend, table):
+    results = ResultCache(backend, ttl=60, namespace="summary", lease=DynamoDBLease(backend))
+    assert results.get_or_compute("k", Compute("value")) == "value"
+    assert backend.get("summary:k")[0] == "value"
+    assert lease_item(table, "summary:k") is None
+
+
+def test_waiter_picks_up_the_holders_result(backend, table, fast_polling):
+    holder = ResultCache(backend, ttl=60, namespace="summary", lease=DynamoDBLease(backend))
+    waiter = ResultCache(backend, ttl=60, namespace="summary", lease=DynamoDBLease(backend))
+    assert holder.lease.acquire("summary:k")
+
+    compute = Compute("waiter's own")
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", waiter.get_or_compute("k", compute)))
+    thread.start()
+    time.sleep(0.2)
+    assert thread.is_alive()  # waiting on the holder, not computing
+
+    holder.set("k", "holder's result")
+    holder.lease.release("summary:k")
+    thread.join(5)
+    assert result["value"] == "holder's result"
+    assert compute.calls == 0
+
+
+def test_waiter_takes_over_when_the_holder_stores_nothing(backend, fast_polling):
+    holder_lease = DynamoDBLease(backend)
+    waiter = ResultCache(backend, ttl=60, lease=DynamoDBLease(backend))
+    assert holder_lease.acquire("k")
+
+    compute = Compute("recomputed")
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", waiter.get_or_compute("k", compute)))
+    thread.start()
+    time.sleep(0.2)
+    holder_lease.release("k")  # e.g. the scrape found nothing
+    thread.join(5)
+    assert result["value"] == "recomputed"
+    assert compute.calls == 1
+
+
+def test_lease_errors_fall_back_to_computing(table):
+    backend = DynamoDBBackend(table_name="no-such-table", region="us-east-2")
+    results = ResultCache(backend, ttl=60, lease=DynamoDBLease(backend))
+    assert results.get_or_compute("k", Compute("value")) == "value"
+
+
+def test_make_lease_needs_the_dynamodb_backend(backend):
+    assert make_lease(backend, enabled=False) is None
+    assert make_lease(cache.LRUBackend(), enabled=True) is None
+    assert isinstance(make_lease(backend, enabled=True), DynamoDBLease)
@@ -0,0 +1,32 @@
+from dedup import DedupIndex, ScrapeDedup
+
+DESCRIPTION = (
+    "We are hiring a data engineer to build batch and streaming pipelines in Python and SQL "
+    "on AWS, with Spark, Airflow and dbt. You will own data quality checks, work with analysts "
+    "on the warehouse model and help the team move reports off spreadsheets."
+)
+ORIGINAL = {"job_id": "1", "description": DESCRIPTION}
+REPOST = {"job_id": "2", "description": DESCRIPTION + " Posted by Apex Staffing."}
+OTHER = {"job_id": "3", "description": "Nurse practitioner for a rural clinic, night shifts, full benefits and relocation support."}
+
+
+def test_repost_within_one_scrape_is_dropped():
+    dropped = []
+    kept = list(DedupIndex().unique([ORIGINAL, REPOST, OTHER], dropped))
+    assert [job["job_id"] for job in kept] == ["1", "3"]
+    assert dropped == [REPOST]
+
+
+def test_repost_of_an_earlier_runs_posting_counts_once(tmp_path):
+    path = str(tmp_path / "dedup.jsonl")
+    assert list(DedupIndex(path).unique([ORIGINAL])) == [ORIGINAL]
+
+    index = DedupIndex(path)  # a later run, reloading the assignments
+    scrape = ScrapeDedup(index)
+    assert list(scrape.unique([REPOST, REPOST])) == [REPOST]
+    assert scrape.dropped == [REPOST]
+    assert index.canonical("2", REPOST["description"]) == "1"
+
+
+def test_no_index_keeps_everything():
+    assert list(ScrapeDedup(None).unique([ORIGINAL, REPOST])) == [ORIGINAL, REPOST]
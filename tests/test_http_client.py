@@ -0,0 +1,55 @@
+from http_client import HttpClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Answers GETs from ``responses`` in order, recording the request headers."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def client_with(responses, **kwargs):
+    client = HttpClient(max_retries=0, **kwargs)
+    client.session = FakeSession(responses)
+    return client
+
+
+def test_304_with_an_evicted_validator_refetches_without_using_a_retry():
+    client = client_with([
+        FakeResponse(200, "page one", {"ETag": '"1"'}),
+        FakeResponse(304),
+        FakeResponse(200, "page one", {"ETag": '"1"'}),
+    ])
+    client.get("https://example.com/a")
+    headers = client._conditional_headers("https://example.com/a")
+    client._validators.clear()  # evicted between building the headers and the 304
+
+    client._conditional_headers = lambda url: headers
+    result = client.get("https://example.com/a")
+    assert result == (200, "page one", False)
+    assert client.session.requests[1] == {"If-None-Match": '"1"'}
+    assert client.session.requests[2] == {}
+
+
+def test_validators_are_capped_by_bytes():
+    client = client_with(
+        [FakeResponse(200, "x" * 40, {"ETag": f'"{i}"'}) for i in range(3)],
+        validator_cache_bytes=100,
+    )
+    for i in range(3):
+        client.get(f"https://example.com/{i}")
+    assert list(client._validators) == ["https://example.com/1", "https://example.com/2"]
+    assert client._validator_bytes == 80
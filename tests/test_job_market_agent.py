@@ -0,0 +1,40 @@
+import pytest
+
+import job_market_agent as agent
+from cache import LRUBackend, ResultCache
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    summaries = ResultCache(LRUBackend(), ttl=60, namespace="summary")
+    corpus = ResultCache(LRUBackend(), ttl=60, namespace="corpus")
+    monkeypatch.setattr(agent, "result_cache", summaries)
+    monkeypatch.setattr(agent, "corpus_store", corpus)
+    scrapes = []
+
+    def scrape(role, handle):
+        scrapes.append(role)
+        jobs = [{"title": "Data Scientist", "company": "Acme", "url": "u", "description": "Python and SQL."}]
+        corpus.set(handle, jobs)
+        return {"role": role, "handle": handle}
+
+    monkeypatch.setattr(agent, "_scrape_and_summarize", scrape)
+    return summaries, corpus, scrapes
+
+
+def test_summary_without_local_postings_is_rescraped(caches):
+    summaries, corpus, scrapes = caches
+    # cached by another container: this one never had the postings
+    summaries.set("data scientist|united states|2", {"role": "data scientist", "handle": "x"})
+
+    result = agent.query_job_postings("data scientist|united states|2")
+    assert result.startswith("1 matching postings")
+    assert scrapes == ["data scientist"]
+    assert agent.query_job_postings("data scientist|united states|2").startswith("1 matching postings")
+    assert scrapes == ["data scientist"]
+
+
+def test_unknown_handle_asks_for_a_new_scrape(caches):
+    _, _, scrapes = caches
+    assert "Call scrape_and_extract_skills again" in agent.query_job_postings("nope")
+    assert scrapes == []
@@ -0,0 +1,34 @@
+import pyarrow.parquet as pq
+import pytest
+
+from job_store import JobStore
+
+JOBS = [
+    {"job_id": "1", "title": "Data Engineer", "fetched_at": "2026-10-01 09:00:00"},
+    {"job_id": "2", "title": "Data Engineer II", "fetched_at": "2026-10-01 09:05:00"},
+]
+
+
+def test_failed_write_leaves_the_postings_unseen(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path))
+    write_table = pq.write_table
+
+    def disk_full(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(pq, "write_table", disk_full)
+    with pytest.raises(OSError):
+        store.append("Data Engineer", JOBS)
+    assert store.seen_ids("Data Engineer") == set()
+
+    monkeypatch.setattr(pq, "write_table", write_table)
+    assert store.append("Data Engineer", JOBS) == 2
+    assert store.seen_ids("Data Engineer") == {"1", "2"}
+    assert JobStore(str(tmp_path)).seen_ids("Data Engineer") == {"1", "2"}  # the index on disk too
+
+
+def test_append_skips_stored_and_repeated_ids(tmp_path):
+    store = JobStore(str(tmp_path))
+    assert store.append("Data Engineer", JOBS + JOBS[:1]) == 2
+    assert store.append("Data Engineer", JOBS) == 0
+    assert store.load(["Data Engineer"], ["job_id"]).num_rows == 2
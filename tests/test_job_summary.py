@@ -0,0 +1,36 @@
+from job_summary import QUERY_MAX_LIMIT, query_corpus
+
+JOBS = [
+    {"title": f"Data Scientist {i}", "company": "Acme", "url": f"https://example.com/{i}",
+     "description": f"Posting {i} asks for Python."}
+    for i in range(30)
+]
+
+
+def shown(result):
+    return [line for line in result.splitlines() if line.startswith("- ")]
+
+
+def test_negative_offset_starts_at_the_first_posting():
+    result = query_corpus(JOBS, offset=-1, limit=2, token_budget=10_000)
+    assert result.startswith("30 matching postings; showing 1-2.")
+    assert "Data Scientist 0 @" in shown(result)[0]
+
+
+def test_limit_is_bounded():
+    assert len(shown(query_corpus(JOBS, limit=1000, token_budget=100_000))) == QUERY_MAX_LIMIT
+    assert len(shown(query_corpus(JOBS, limit=0, token_budget=10_000))) == 1
+    assert len(shown(query_corpus(JOBS, limit=-5, token_budget=10_000))) == 1
+
+
+def test_offset_past_the_end():
+    assert query_corpus(JOBS, offset=50) == "30 matching postings; nothing at offset 50."
+
+
+def test_header_counts_the_rows_that_fit():
+    long_jobs = [dict(job, description=f"Posting {i} asks for Python. " + "Details. " * 200)
+                 for i, job in enumerate(JOBS[:10])]
+    result = query_corpus(long_jobs, limit=5, token_budget=250)
+    rows = shown(result)
+    assert 0 < len(rows) < 5
+    assert result.startswith(f"10 matching postings; showing 1-{len(rows)}.")
@@ -0,0 +1,53 @@
+import time
+
+from cache import LRUBackend, ResultCache
+from prewarm import Prewarmer, RequestBudget
+
+T = time.time()
+
+
+def make_prewarmer(compute, budget=100):
+    return Prewarmer(
+        cache=ResultCache(LRUBackend(), ttl=3600),
+        compute=compute,
+        key_for=lambda role: role.lower(),
+        cost_per_refresh=10,
+        budget=RequestBudget(limit=budget, window=3600),
+        seed_roles=["Data Scientist"],
+        empty_backoff=600,
+    )
+
+
+def test_role_with_no_postings_backs_off():
+    calls = []
+
+    def compute(role, key):
+        calls.append(role)
+        return None
+
+    prewarmer = make_prewarmer(compute)
+    assert prewarmer.run_once(now=T) == 0
+    assert prewarmer.run_once(now=T + 300) == 0  # still backing off: no scrape, no budget spent
+    assert calls == ["Data Scientist"]
+    assert prewarmer.budget.remaining(now=T + 300) == 90
+    assert prewarmer.run_once(now=T + 600) == 0
+    assert calls == ["Data Scientist"] * 2
+
+
+def test_failed_refresh_backs_off():
+    calls = []
+
+    def compute(role, key):
+        calls.append(role)
+        raise RuntimeError("LinkedIn returned 429")
+
+    prewarmer = make_prewarmer(compute)
+    prewarmer.run_once(now=T)
+    prewarmer.run_once(now=T + 100)
+    assert calls == ["Data Scientist"]
+
+
+def test_refreshed_role_is_cached():
+    prewarmer = make_prewarmer(lambda role, key: f"summary of {role}")
+    assert prewarmer.run_once(now=T) == 1
+    assert prewarmer.cache.get("data scientist") == "summary of Data Scientist"
@@ -0,0 +1,24 @@
+import os
+
+from job_store import JobStore
+from skill_trends import SkillTrends
+
+JOBS = [
+    {"job_id": "1", "title": "Data Engineer", "description": "Python and SQL pipelines on AWS.",
+     "fetched_at": "2026-10-01 09:00:00"},
+]
+
+
+def test_unreadable_part_is_skipped(tmp_path):
+    store = JobStore(str(tmp_path))
+    store.append("Data Engineer", JOBS)
+    partition = tmp_path / "role=data-engineer" / "fetch_date=2026-10-02"
+    os.makedirs(partition)
+    (partition / "part-broken.parquet").write_bytes(b"not parquet")
+
+    trends = SkillTrends(store)
+    assert trends.sync(force=True) == 1
+    assert trends.sync(force=True) == 0  # the bad part is not retried
+    report = trends.top_skills("Data Engineer", until="2026-10-02")
+    assert report["jobs"] == 1
+    assert "Python" in [name for name, _, _ in report["skills"]]
@@ -0,0 +1,123 @@
+import io
+import json
+import threading
+
+import pytest
+
+from cache import LRUBackend, ResultCache
+from job_summary import estimate_tokens
+from summarize import CHUNK_PROMPT, MERGE_PROMPT, SUMMARIZE_PROMPT, MapReduceSummarizer, split_text
+
+
+class StubBedrockClient:
+    """Records prompts; each reply is ``reply(prompt)``."""
+
+    def __init__(self, reply=lambda prompt: f"summary of {len(prompt)} chars"):
+        self.reply = reply
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId, body):
+        prompt = json.loads(body)["messages"][0]["content"]
+        with self._lock:
+            self.prompts.append(prompt)
+        payload = {"output": {"message": {"content": [{"text": self.reply(prompt)}]}}}
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+    def calls(self, template):
+        prefix = template.split("{text}")[0]
+        return [p for p in self.prompts if p.startswith(prefix)]
+
+
+def sentences(n):
+    # scraped descriptions are whitespace-collapsed single lines
+    return " ".join(f"Sentence number {i} asks for Python and SQL." for i in range(n))
+
+
+def make_summarizer(client, **kwargs):
+    kwargs.setdefault("chunk_tokens", 100)
+    kwargs.setdefault("single_call_tokens", 150)
+    return MapReduceSummarizer(
+        "stub-model", client=client, max_workers=2,
+        cache=ResultCache(LRUBackend(), ttl=3600, namespace="test"), **kwargs
+    )
+
+
+@pytest.mark.parametrize("text", [
+    sentences(200),
+    "\n\n".join(sentences(30) for _ in range(5)),
+    "line one\n" * 300,
+    "x" * 2000 + " tail.",
+    "  leading blanks. " + sentences(50) + "\n\n\n",
+])
+def test_split_text_round_trips_and_fits(text):
+    chunks = split_text(text, 100)
+    assert "".join(chunks) == text
+    assert len(chunks) > 1
+    assert all(chunk.strip() for chunk in chunks)
+    assert all(estimate_tokens(chunk) <= 100 + 1 for chunk in chunks)
+
+
+def test_split_text_cuts_single_line_text_at_sentence_ends():
+    chunks = split_text(sentences(200), 100)
+    assert all(chunk.rstrip().endswith(".") for chunk in chunks)
+    assert all(".Sentence" not in chunk for chunk in chunks)
+
+
+def test_split_text_blank_and_short():
+    assert split_text("   \n\n ", 100) == []
+    assert split_text("short text", 100) == ["short text"]
+
+
+def test_short_input_is_one_call():
+    client = StubBedrockClient()
+    prompt = SUMMARIZE_PROMPT.format(text="Python and SQL.")
+    assert make_summarizer(client).summarize("Python and SQL.") == f"summary of {len(prompt)} chars"
+    assert client.prompts == [prompt]
+
+
+def test_long_input_maps_chunks_then_merges():
+    client = StubBedrockClient()
+    text = sentences(200)
+    result = make_summarizer(client).summarize(text)
+
+    chunks = split_text(text, 100)
+    assert sorted(client.calls(CHUNK_PROMPT)) == sorted(CHUNK_PROMPT.format(text=c) for c in chunks)
+    merges = client.calls(MERGE_PROMPT)
+    assert len(merges) == 1
+    assert client.prompts[-1] == merges[0]
+    assert result == f"summary of {len(merges[0])} chars"
+
+
+def test_repeated_input_and_shared_chunks_hit_the_cache():
+    client = StubBedrockClient()
+    summarizer = make_summarizer(client)
+    text = sentences(200)
+    first = summarizer.summarize(text)
+    calls = len(client.prompts)
+
+    assert summarizer.summarize(text) == first
+    assert len(client.prompts) == calls
+
+    # a text sharing its leading chunks only pays for the new ones
+    summarizer.summarize(text + " " + sentences(20))
+    new_chunk_calls = len(client.calls(CHUNK_PROMPT)) - len(split_text(text, 100))
+    assert 0 < new_chunk_calls < len(split_text(text + " " + sentences(20), 100))
+
+
+def test_merge_repeats_until_partials_fit():
+    # every summary is ~40 tokens, so 50 partials need several merge rounds
+    client = StubBedrockClient(reply=lambda prompt: "Partial summary mentions Python. " * 5)
+    make_summarizer(client).summarize(sentences(400))
+
+    merges = client.calls(MERGE_PROMPT)
+    assert len(merges) > 2
+    assert all(estimate_tokens(m) <= 100 + estimate_tokens(MERGE_PROMPT) for m in merges[:-1])
+    assert estimate_tokens(merges[-1]) <= 150 + estimate_tokens(MERGE_PROMPT)
+
+
+def test_merge_stops_when_summaries_do_not_shrink():
+    # a model that echoes its input never shrinks anything; the loop must end
+    client = StubBedrockClient(reply=lambda prompt: prompt.split("\n\n", 1)[1])
+    make_summarizer(client).summarize(sentences(200))
+    assert client.prompts[-1].startswith(MERGE_PROMPT.split("{text}")[0])